@@ -0,0 +1,98 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# -----------------------------
+# Shared keep-alive session for MLB The Show API calls (ML loaders; the web app wraps it with metrics)
+# -----------------------------
+API_BASE_URL = os.getenv("MLB_API_BASE_URL", "https://mlb25.theshow.com/apis").rstrip("/")
+
+CONNECT_TIMEOUT = float(os.getenv("MLB_API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("MLB_API_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("MLB_API_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.getenv("MLB_API_BACKOFF_FACTOR", "0.5"))
+POOL_SIZE = int(os.getenv("MLB_API_POOL_SIZE", "20"))
+MAX_CONCURRENCY_PER_HOST = int(os.getenv("MLB_API_MAX_CONCURRENCY_PER_HOST", "10"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+
+def api_url(endpoint: str) -> str:
+    """
+    Builds the full URL for an API endpoint such as 'listings.json'.
+    Absolute URLs are passed through untouched.
+    """
+    if endpoint.startswith(("http://", "https://")):
+        return endpoint
+    return f"{API_BASE_URL}/{endpoint.lstrip('/')}"
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide keep-alive session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    limit = _host_limits.get(host)
+    if limit is None:
+        with _host_limits_lock:
+            limit = _host_limits.setdefault(host, threading.BoundedSemaphore(MAX_CONCURRENCY_PER_HOST))
+    return limit
+
+
+def get(endpoint: str, params=None, timeout=None) -> requests.Response:
+    """
+    GETs an API endpoint through the shared session.
+
+    Args:
+        endpoint (str): Endpoint name ('listings.json') or absolute URL.
+        params (dict): Query parameters.
+        timeout (float | tuple): Overrides the default (connect, read) timeout.
+
+    Returns:
+        requests.Response: The final response after any retries on 429/5xx.
+    """
+    url = api_url(endpoint)
+    with _host_limit(url):
+        return get_session().get(url, params=params, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT))
+
+
+def close():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -1,16 +1,23 @@
 import os
 import json
+import logging
 import time
-import requests
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+from prediction_model import api_client
+from prediction_model.logs import log_event, timed
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------
 # Load roster update metadata
 # -----------------------------
 def get_update_data(id:int):
-    url = "https://mlb25.theshow.com/apis/roster_update.json"
     params = {"id" : id}
-    response = requests.get(url, params=params)
+    response = api_client.get("roster_update.json", params=params)
     if response.status_code != 200:
         raise Exception(f"Failed to fetch data: {response.status_code}")
     data = response.json()
@@ -19,35 +26,123 @@ def get_update_data(id:int):
 # -----------------------------
 # Caching logic for player data
 # -----------------------------
+def cache_path_for(uuid: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"player_{uuid}.json")
+
 def get_cached_player_data(uuid: str, cache_dir: str) -> dict:
+    """
+    Returns a player's data from the columnar store (attribute fields only), falling back
+    to the player_<uuid>.json cache file and then the API.
+    """
     os.makedirs(cache_dir, exist_ok=True)
-    cache_path = os.path.join(cache_dir, f"player_{uuid}.json")
+    store = read_attribute_store(cache_dir)
+    if store is not None and uuid in store.index:
+        # Plain Python values (NaN as None), the same shape as the JSON cache file
+        row = store.loc[[uuid]]
+        return {"uuid": uuid, **row.astype(object).where(row.notna(), None).to_dict(orient="records")[0]}
+
+    cache_path = cache_path_for(uuid, cache_dir)
 
     # Return from cache if exists
     if os.path.exists(cache_path):
-        print(f"[Cache hit] {uuid}")
         with open(cache_path, "r") as f:
             return json.load(f)
 
     # Otherwise, fetch from API
     data = get_player_data(uuid)
     if data:
-        with open(cache_path, "w") as f:
-            json.dump(data, f)
+        write_json_atomic(cache_path, data)
     return data
 
+def write_json_atomic(path: str, data: dict):
+    """
+    Writes to a temp file in the same directory and renames it into place, so a
+    crashed or concurrent run never leaves a half-written cache file behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 def get_player_data(uuid: str) -> dict:
-    url = "https://mlb25.theshow.com/apis/item.json"
     params = {"uuid": uuid}
-    print(f"Calling API for UUID {uuid}") 
-    response = requests.get(url, params=params)
+    response = api_client.get("item.json", params=params)
     if response.status_code != 200:
         raise Exception(f"Failed to fetch player {uuid}: {response.status_code}")
     return response.json()
 
+# -----------------------------
+# Concurrent cache warming
+# -----------------------------
+class RateLimiter:
+    """
+    Spaces request starts at least 1/rate seconds apart across all threads.
+    """
+    def __init__(self, rate: float = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+def warm_player_cache(uuids: list[str], cache_dir: str, workers: int = 8, rate_limit: float = None) -> dict:
+    """
+    Fetches every uuid missing from cache_dir using a thread pool.
+
+    Retries with backoff on 429/5xx and connection errors come from the shared HTTP client;
+    cache files are written atomically.
+
+    Args:
+        uuids (list[str]): Player UUIDs to cache.
+        cache_dir (str): Cache directory (player_<uuid>.json files).
+        workers (int): Number of concurrent fetches.
+        rate_limit (float): Max requests per second across all workers (None = unlimited).
+
+    Returns:
+        dict: Counts of 'cached' (already present), 'fetched' and 'failed' uuids.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    # Blank/None uuids are neither cached nor fetched
+    requested = [u for u in dict.fromkeys(uuids) if u]
+    missing = [u for u in requested if not os.path.exists(cache_path_for(u, cache_dir))]
+    stats = {"cached": len(requested) - len(missing), "fetched": 0, "failed": 0}
+    limiter = RateLimiter(rate_limit)
+    started = time.perf_counter()
+
+    def fetch(uuid):
+        limiter.wait()
+        data = get_player_data(uuid)
+        if data:
+            write_json_atomic(cache_path_for(uuid, cache_dir), data)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch, uuid): uuid for uuid in missing}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                stats["fetched"] += 1
+            except Exception as e:
+                stats["failed"] += 1
+                log_event(logger, "fetch_failed", logging.WARNING, uuid=futures[future], error=str(e))
+    log_event(logger, "stage", stage="warm_player_cache", duration_s=time.perf_counter() - started, workers=workers, **stats)
+    return stats
+
 # -----------------------------
 # Build roster update dataset
 # -----------------------------
+@timed(logger)
 def load_roster_update_data(id: int) -> pd.DataFrame:
     update_data = get_update_data(id)
     players = []
@@ -71,61 +166,179 @@ def load_roster_update_data(id: int) -> pd.DataFrame:
     return pd.DataFrame(players)
 
 
+# -----------------------------
+# Consolidated columnar attribute store
+# -----------------------------
+ATTRIBUTE_STORE = "attributes.parquet"
+
+# Declarative attribute schema: (dataset column, raw item.json field, dtype, group).
+# Ratings fit in int16; the "hitter"/"pitcher" group decides which split a column lands in.
+ATTRIBUTE_SCHEMA = [
+    ("player_name", "name", "object", "common"),
+    ("player_id", "uuid", "object", "common"),
+    ("overall_rating", "ovr", "int16", "common"),
+    ("is_hitter", "is_hitter", "bool", "common"),
+    ("contact_left", "contact_left", "int16", "hitter"),
+    ("contact_right", "contact_right", "int16", "hitter"),
+    ("power_left", "power_left", "int16", "hitter"),
+    ("power_right", "power_right", "int16", "hitter"),
+    ("vision", "plate_vision", "int16", "hitter"),
+    ("discipline", "plate_discipline", "int16", "hitter"),
+    ("hits_per_9", "hits_per_bf", "int16", "pitcher"),
+    ("k_per_9", "k_per_bf", "int16", "pitcher"),
+    ("bb_per_9", "bb_per_bf", "int16", "pitcher"),
+    ("hr_per_9", "hr_per_bf", "int16", "pitcher"),
+]
+ATTRIBUTE_COLUMNS = [column for column, _, _, _ in ATTRIBUTE_SCHEMA]
+HITTER_COLUMNS = [column for column, _, _, group in ATTRIBUTE_SCHEMA if group != "pitcher"]
+PITCHER_COLUMNS = [column for column, _, _, group in ATTRIBUTE_SCHEMA if group != "hitter"]
+
+# Raw item.json fields kept in the store (uuid is the store index)
+ATTRIBUTE_FIELDS = {field: column for column, field, _, _ in ATTRIBUTE_SCHEMA if field != "uuid"}
+_FIELD_DTYPES = {field: dtype for _, field, dtype, _ in ATTRIBUTE_SCHEMA}
+
+def _typed_column(values, dtype: str) -> np.ndarray:
+    """
+    Packs one column into its compact dtype. Columns with missing values fall back to
+    float32 (NaN) for numbers and object for flags.
+    """
+    if dtype == "object":
+        return np.asarray(values, dtype=object)
+    missing = pd.isna(values)
+    if not missing.any():
+        return np.asarray(values).astype(dtype)
+    if dtype == "bool":
+        return np.asarray(values, dtype=object)
+    return np.asarray(values, dtype=np.float32)
+
+def extract_attributes(records, split: bool = False):
+    """
+    Builds the attribute dataset from raw player data in one columnar pass.
+
+    Args:
+        records: Raw item.json dicts (each with 'uuid'), or a store frame indexed by uuid.
+        split (bool): Also split into hitters/pitchers, each with only its own columns.
+
+    Returns:
+        pd.DataFrame, or (hitters_df, pitchers_df) when split=True.
+    """
+    if isinstance(records, pd.DataFrame):
+        def values(field):
+            return records.index.to_numpy() if field == "uuid" else records[field].to_numpy()
+    else:
+        records = list(records)
+        def values(field):
+            return [r.get(field) for r in records]
+
+    columns = {column: _typed_column(values(field), dtype) for column, field, dtype, _ in ATTRIBUTE_SCHEMA}
+    if not split:
+        return pd.DataFrame(columns, columns=ATTRIBUTE_COLUMNS)
+
+    is_hitter = columns["is_hitter"]
+    hitters = is_hitter == True
+    pitchers = is_hitter == False
+    hitters_df = pd.DataFrame({c: columns[c][hitters] for c in HITTER_COLUMNS}, columns=HITTER_COLUMNS)
+    pitchers_df = pd.DataFrame({c: columns[c][pitchers] for c in PITCHER_COLUMNS}, columns=PITCHER_COLUMNS)
+    return hitters_df, pitchers_df
+
+_store_memo = {}
+
+def read_attribute_store(cache_dir: str) -> pd.DataFrame | None:
+    """
+    Reads <cache_dir>/attributes.parquet (raw fields, indexed by uuid) in one columnar read.
+    The frame is memoized until the file changes on disk.
+    """
+    path = os.path.join(cache_dir, ATTRIBUTE_STORE)
+    if not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    memo = _store_memo.get(path)
+    if memo is None or memo[0] != mtime:
+        memo = _store_memo[path] = (mtime, pd.read_parquet(path))
+    return memo[1]
+
+def write_attribute_store(cache_dir: str, store: pd.DataFrame):
+    path = os.path.join(cache_dir, ATTRIBUTE_STORE)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        store.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _store_record(uuid: str, data: dict) -> dict:
+    return {"uuid": uuid, **{field: data.get(field) for field in ATTRIBUTE_FIELDS}}
+
+def add_to_attribute_store(cache_dir: str, records: list[dict]) -> pd.DataFrame:
+    """
+    Merges new raw records (see _store_record) into the store, newest record winning per uuid.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    new = pd.DataFrame(records).set_index("uuid")
+    new = new.astype({f: d for f, d in _FIELD_DTYPES.items() if f in new and d != "object" and not new[f].isna().any()})
+    store = read_attribute_store(cache_dir)
+    if store is not None:
+        new = pd.concat([store[~store.index.isin(new.index)], new])
+    write_attribute_store(cache_dir, new)
+    return new
+
+def migrate_json_cache(cache_dir: str) -> int:
+    """
+    One-shot migration of every player_<uuid>.json file in cache_dir into attributes.parquet.
+
+    Returns:
+        int: Number of players written to the store.
+    """
+    records = []
+    for filename in sorted(os.listdir(cache_dir)):
+        if filename.startswith("player_") and filename.endswith(".json"):
+            with open(os.path.join(cache_dir, filename), "r") as f:
+                records.append(_store_record(filename[len("player_"):-len(".json")], json.load(f)))
+    if records:
+        add_to_attribute_store(cache_dir, records)
+    return len(records)
+
 # -----------------------------
 # Build attribute dataset
 # -----------------------------
-def load_player_attributes(uuids: list[str], cache_dir: str, sleep_time=0.25) -> pd.DataFrame:
-    player_attributes = []
-    for uuid in uuids:
-        try:
-            data = get_cached_player_data(uuid, cache_dir)
-
-            if not data:
-                print(f"Skipping UUID {uuid} - no data returned")
-                continue
-            
-            # Pull key attributes
-            player_name = data.get("name")
-            overall = data.get("ovr")
-            position = data.get("display_position")
-            is_hitter = data.get("is_hitter")
-
-            # Pull key hitting attributes
-            contact_left = data.get("contact_left")
-            contact_right = data.get("contact_right")
-            power_left = data.get("power_left")
-            power_right = data.get("power_right")
-            vision = data.get("plate_vision")
-            discipline = data.get("plate_discipline")
-
-            # Pull key pitching attributes
-            hits_per_9 = data.get("hits_per_bf")
-            k_per_9 = data.get("k_per_bf")
-            bb_per_9 = data.get("bb_per_bf")
-            hr_per_9 = data.get("hr_per_bf")
-
-            # Add this attributes to in memory list 
-            player_attributes.append({
-                "player_name": player_name,
-                "player_id": uuid,
-                "overall_rating": overall,
-                "is_hitter": is_hitter,
-                "contact_left": contact_left,
-                "contact_right": contact_right,
-                "power_left": power_left,
-                "power_right": power_right,
-                "vision": vision,
-                "discipline": discipline,
-                "hits_per_9": hits_per_9,
-                "k_per_9": k_per_9,
-                "bb_per_9": bb_per_9,
-                "hr_per_9": hr_per_9
-            })
-        except Exception as e:
-            print(f"Error fetching data for UUID {uuid}: {e}")
-        
-        # time.sleep(sleep_time)
-    return pd.DataFrame(player_attributes)
+@timed(logger)
+def load_player_attributes(uuids: list[str], cache_dir: str, workers: int = 1, rate_limit: float = None, split: bool = False):
+    """
+    Builds the attribute dataset for the given uuids with one bulk read of the
+    columnar store. Players missing from the store are loaded from their JSON cache
+    file (or the API) and folded into the store for next time.
+
+    With split=True returns (hitters_df, pitchers_df) built in the same pass
+    (see extract_attributes).
+    """
+    store = read_attribute_store(cache_dir)
+    known = store.index if store is not None else pd.Index([])
+    missing = [uuid for uuid in dict.fromkeys(uuids) if uuid not in known]
+    log_event(logger, "attribute_store", logging.DEBUG, requested=len(uuids), missing=len(missing))
+
+    if missing:
+        # Fill cache misses concurrently up front; the loop below then only reads from disk
+        if workers > 1:
+            warm_player_cache(missing, cache_dir, workers=workers, rate_limit=rate_limit)
+
+        records = []
+        for uuid in missing:
+            try:
+                data = get_cached_player_data(uuid, cache_dir)
+                if not data:
+                    log_event(logger, "player_skipped", logging.WARNING, uuid=uuid, reason="no data returned")
+                    continue
+                records.append(_store_record(uuid, data))
+            except Exception as e:
+                log_event(logger, "fetch_failed", logging.WARNING, uuid=uuid, error=str(e))
+        if records:
+            store = add_to_attribute_store(cache_dir, records)
+
+    if store is None:
+        return extract_attributes([], split=split)
+    return extract_attributes(store.loc[[uuid for uuid in uuids if uuid in store.index]], split=split)
 
 def get_live_series_uuids_from_listings(delay: float = 0.25, max_pages: int = 76):
     """
@@ -142,21 +355,20 @@ def get_live_series_uuids_from_listings(delay: float = 0.25, max_pages: int = 76
     page = 1
 
     while page <= max_pages:
-        url = "https://mlb25.theshow.com/apis/listings.json"
         params = {
             "series_id": "1337",
             "page": page
         }
-        response = requests.get(url, params=params)
+        response = api_client.get("listings.json", params=params)
         if response.status_code != 200:
-            print(f"Failed to fetch page {page}, status code {response.status_code}")
+            log_event(logger, "listings_page_failed", logging.WARNING, page=page, status=response.status_code)
             break
 
         data = response.json()
         listings = data.get("listings", [])
 
         if not listings:
-            print(f"No more listings after page {page}. Stopping.")
+            log_event(logger, "listings_done", page=page, uuids=len(uuids))
             break
 
         for listing in listings:
@@ -164,7 +376,7 @@ def get_live_series_uuids_from_listings(delay: float = 0.25, max_pages: int = 76
             if uuid:
                 uuids.add(uuid)
 
-        print(f"✅ Page {page} fetched. Total UUIDs so far: {len(uuids)}")
+        log_event(logger, "listings_page", page=page, uuids=len(uuids))
         page += 1
         time.sleep(delay)
 
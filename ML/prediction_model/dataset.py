@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from prediction_model.logs import log_event, timed
+from prediction_model.pipeline import DEFAULT_CACHE_DIR, Pipeline, build_hitter_dataset
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "roster_updates.json")
+
+# -----------------------------
+# Roster update manifest
+# -----------------------------
+def load_manifest(path: str = DEFAULT_MANIFEST) -> dict:
+    """
+    Reads the roster update manifest: update id -> pre-update attribute cache and the
+    FanGraphs LHP/RHP split CSVs covering the window before that update.
+    Relative paths are resolved against the manifest's directory.
+
+    Returns:
+        dict[int, dict]: {update_id: {"attribute_cache": ..., "fg_lhp": ..., "fg_rhp": ...}}
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, "r") as f:
+        raw = json.load(f)
+    manifest = {}
+    for update_id, spec in raw.items():
+        manifest[int(update_id)] = {key: os.path.normpath(os.path.join(base, value)) for key, value in spec.items()}
+    return manifest
+
+# -----------------------------
+# Parallel per-update builder
+# -----------------------------
+def build_update_dataset(update_id: int, spec: dict, pipeline_cache_dir: str = DEFAULT_CACHE_DIR, crosswalk_path: str = None) -> pd.DataFrame:
+    """
+    Builds one roster update's hitter table (runs inside a worker process).
+    """
+    pipeline = Pipeline(pipeline_cache_dir, verbose=False)
+    df = build_hitter_dataset(update_id, spec["attribute_cache"], spec["fg_lhp"], spec["fg_rhp"], pipeline=pipeline, crosswalk_path=crosswalk_path)
+    df.insert(0, "update_id", update_id)
+    return df
+
+@timed(logger)
+def build_training_set(update_ids, manifest: dict = None, workers: int = None, pipeline_cache_dir: str = DEFAULT_CACHE_DIR, output_path: str = None, crosswalk_path: str = None) -> pd.DataFrame:
+    """
+    Builds the training table for several roster updates, one process per update.
+
+    Each update is paired with its own pre-update attribute cache and FanGraphs window
+    from the manifest, and every stage goes through the shared pipeline cache, so
+    re-running with an extra update only computes the new one.
+
+    Args:
+        update_ids: Roster update ids (e.g. range(5, 12)).
+        manifest (dict): See load_manifest (defaults to data/roster_updates.json).
+        workers (int): Worker processes (default: one per update, capped at the CPU count).
+        pipeline_cache_dir (str): Stage cache shared by all workers.
+        crosswalk_path (str): uuid <-> playerId crosswalk shared by all workers
+            (default name_matching.DEFAULT_CROSSWALK_PATH).
+        output_path (str): Optional Parquet dataset directory, partitioned by update_id.
+            Partitions for the updates being built are replaced; other updates' partitions
+            already in the directory are left alone.
+
+    Returns:
+        pd.DataFrame: All updates concatenated, with an update_id column.
+    """
+    manifest = manifest if manifest is not None else load_manifest()
+    update_ids = list(dict.fromkeys(update_ids))
+    unknown = [u for u in update_ids if u not in manifest]
+    if unknown:
+        raise ValueError(f"No manifest entry for roster update(s): {unknown}")
+
+    workers = workers or min(len(update_ids), os.cpu_count() or 1)
+    frames = {}
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(build_update_dataset, update_id, manifest[update_id], pipeline_cache_dir, crosswalk_path): update_id
+            for update_id in update_ids
+        }
+        for future in as_completed(futures):
+            update_id = futures[future]
+            try:
+                frames[update_id] = future.result()
+            except Exception as e:
+                log_event(logger, "update_failed", logging.ERROR, update_id=update_id, error=str(e))
+
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat([frames[u] for u in update_ids if u in frames], ignore_index=True)
+
+    if output_path:
+        # One directory per update, so a single update can be read (or rebuilt) on its own
+        df.to_parquet(output_path, engine="pyarrow", partition_cols=["update_id"], existing_data_behavior="delete_matching")
+    return df
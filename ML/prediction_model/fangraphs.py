@@ -0,0 +1,122 @@
+import logging
+import os
+import re
+import numpy as np
+import pandas as pd
+from prediction_model.logs import timed
+
+logger = logging.getLogger(__name__)
+
+# Columns kept from FanGraphs split exports, with the dtype each is stored as. Stats feed
+# the model directly, so they stay float64 and match a plain read_csv exactly.
+# Percent columns may arrive as '8.3 %' strings and are parsed to fractions at read time.
+HITTER_FG_SCHEMA = {
+    "Name": "object",
+    "playerId": "int32",
+    "BB%": "percent",
+    "K%": "percent",
+    "AVG": "float64",
+    "OBP": "float64",
+    "SLG": "float64",
+}
+PITCHER_FG_SCHEMA = {
+    "Name": "object",
+    "playerId": "int32",
+    "K%": "percent",
+    "BB%": "percent",
+    "K/9": "float64",
+    "BB/9": "float64",
+    "HR/9": "float64",
+    "AVG": "float64",
+    "WHIP": "float64",
+    "ERA": "float64",
+    "FIP": "float64",
+}
+KEY_COLUMNS = ("Name", "playerId")
+
+_SPLIT_FILE = re.compile(r"^fg_(?P<window>.+)_(?P<hand>LHP|RHP)\.csv$", re.IGNORECASE)
+
+# -----------------------------
+# Typed reads
+# -----------------------------
+def _parse_percent(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    text = values.astype("string").str.strip()
+    has_sign = text.str.endswith("%").fillna(False).to_numpy()
+    numbers = pd.to_numeric(text.str.rstrip("%").str.strip(), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    numbers[has_sign] /= 100
+    return pd.Series(numbers, index=values.index)
+
+def read_fg_split(path: str, schema: dict = HITTER_FG_SCHEMA, chunksize: int = None) -> pd.DataFrame:
+    """
+    Reads one FanGraphs split export, keeping only the schema's columns (missing ones are
+    skipped) with compact dtypes, one row per playerId.
+    """
+    read_dtypes = {col: ("string" if dtype == "percent" else dtype) for col, dtype in schema.items() if col != "playerId"}
+    chunks = pd.read_csv(path, usecols=lambda col: col in schema, dtype=read_dtypes, chunksize=chunksize)
+    if chunksize is None:
+        chunks = [chunks]
+
+    frames = []
+    for chunk in chunks:
+        chunk = chunk.dropna(subset=["playerId"])
+        for col, dtype in schema.items():
+            if col not in chunk:
+                continue
+            if dtype == "percent":
+                chunk[col] = _parse_percent(chunk[col])
+            elif col == "playerId":
+                chunk[col] = chunk[col].astype(dtype)
+        frames.append(chunk)
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return df.drop_duplicates(subset="playerId").set_index("playerId")
+
+# -----------------------------
+# Many splits -> one wide frame
+# -----------------------------
+def find_split_files(directory: str, windows: list[str] = None) -> dict:
+    """
+    Finds fg_<window>_<LHP|RHP>.csv exports in a directory.
+
+    Returns:
+        dict: {column prefix: path}, prefixes like '5-24_6-10_lhp_'. With a single
+        window the prefixes are just 'lhp_'/'rhp_', matching merge_lhp_rhp.
+    """
+    found = []
+    for filename in sorted(os.listdir(directory)):
+        match = _SPLIT_FILE.match(filename)
+        if match and (windows is None or match["window"] in windows):
+            found.append((match["window"], match["hand"].lower(), os.path.join(directory, filename)))
+    single_window = len({window for window, _, _ in found}) == 1
+    return {(f"{hand}_" if single_window else f"{window}_{hand}_"): path for window, hand, path in found}
+
+@timed(logger)
+def load_fg_splits(splits: dict, schema: dict = HITTER_FG_SCHEMA, chunksize: int = None) -> pd.DataFrame:
+    """
+    Loads several FanGraphs split exports into one wide frame keyed by playerId.
+
+    Args:
+        splits (dict): {column prefix: csv path}, e.g. {"lhp_": ..., "rhp_": ...} or
+            the output of find_split_files for many windows.
+        schema (dict): HITTER_FG_SCHEMA or PITCHER_FG_SCHEMA (or a custom column -> dtype map).
+        chunksize (int): Read each file in chunks of this many rows.
+
+    Returns:
+        pd.DataFrame: playerId, Name, then <prefix><stat> columns for every split.
+    """
+    names, blocks = [], []
+    for prefix, path in splits.items():
+        split = read_fg_split(path, schema, chunksize)
+        if "Name" in split:
+            names.append(split.pop("Name"))
+        blocks.append(split.add_prefix(prefix))
+
+    # One outer alignment over every split instead of a merge per pair
+    wide = pd.concat(blocks, axis=1, join="outer", sort=True) if blocks else pd.DataFrame()
+    name = pd.Series(index=wide.index, dtype="object")
+    for split_names in names:
+        name = name.fillna(split_names)
+    wide.insert(0, "Name", name)
+    wide.index.name = "playerId"
+    return wide.reset_index()
@@ -0,0 +1,123 @@
+import functools
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# -----------------------------
+# Structured (key=value) logging for the ML loaders
+# -----------------------------
+LOGGER_NAME = "prediction_model"
+ENABLED = os.getenv("MLB_ML_LOGGING", "1").lower() not in ("0", "false", "off")
+LEVEL = os.getenv("MLB_ML_LOG_LEVEL", "INFO").upper()
+
+_OFF = logging.CRITICAL + 1
+
+
+# '<time> INFO prediction_model.data_loader stage stage=load_player_attributes duration_s=0.041 rows=321'
+FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+
+class _Fields:
+    # key=value rendering of an event's fields, done only if a handler emits the record
+    def __init__(self, fields: dict):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(f"{key}={_format_field(value)}" for key, value in self.fields.items())
+
+
+class _FallbackHandler(logging.StreamHandler):
+    """
+    Prints to stderr only while the root logger has no handlers (a notebook or script that
+    never configured logging). Once an application configures logging, records go
+    through its handlers alone.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        if not logging.getLogger().handlers:
+            super().emit(record)
+
+
+def _format_field(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if isinstance(value, str) and value and " " not in value and "=" not in value:
+        return value
+    return json.dumps(value, default=str)
+
+
+def set_logging(enabled: bool = True, level: str = None):
+    """
+    Turns ML loader logging on or off for this process (MLB_ML_LOGGING=0 does the same at import).
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel((level or LEVEL) if enabled else _OFF)
+
+
+def _configure():
+    logger = logging.getLogger(LOGGER_NAME)
+    if not any(isinstance(h, _FallbackHandler) for h in logger.handlers):
+        handler = _FallbackHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(FORMAT))
+        logger.addHandler(handler)
+    set_logging(ENABLED)
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, **fields):
+    """
+    Logs '<event> key=value ...'. The raw fields also ride along as record.fields for
+    structured handlers.
+    """
+    if fields:
+        logger.log(level, "%s %s", event, _Fields(fields), extra={"fields": fields})
+    else:
+        logger.log(level, event, extra={"fields": fields})
+
+
+@contextmanager
+def stage_timer(logger: logging.Logger, stage: str, level: int = logging.INFO, **fields):
+    """
+    Logs one 'stage' event with its duration when the block exits. The yielded dict can
+    be filled with result fields (e.g. rows) inside the block.
+    """
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        if logger.isEnabledFor(level):
+            log_event(logger, "stage", level, stage=stage, status=status, duration_s=time.perf_counter() - started, **fields)
+
+
+def _rows(result):
+    if isinstance(result, tuple):
+        return sum(len(part) for part in result if hasattr(part, "__len__"))
+    return len(result) if hasattr(result, "__len__") else None
+
+
+def timed(logger: logging.Logger, stage: str = None, level: int = logging.INFO):
+    """
+    Decorator form of stage_timer: logs the function's duration and result size (rows).
+    """
+    def decorate(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(logger, name, level) as fields:
+                result = func(*args, **kwargs)
+                rows = _rows(result)
+                if rows is not None:
+                    fields["rows"] = rows
+                return result
+        return wrapper
+    return decorate
+
+
+_configure()
@@ -1,10 +1,16 @@
 from prediction_model.tracking import log_model_performance
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, f1_score, classification_report
+from sklearn.model_selection import train_test_split, StratifiedKFold, ParameterGrid, ParameterSampler
+from sklearn.metrics import accuracy_score, f1_score, classification_report, log_loss
 from xgboost import XGBClassifier
 from prediction_model.tracking import log_model_performance  # if using logging module
-import joblib
-import os
+from prediction_model import registry
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import time
+
+# Identifiers and label-derived columns that are never features (dropped when present)
+DEFAULT_DROP_COLUMNS = ["player_id", "player_name", "is_hitter", "new_overall", "overall_rating", "playerId", "update_id"]
 
 def make_discrepancy_features(df):
     # 1. Normalize in-game attributes to 0–1 scale using live series max of 115
@@ -47,7 +53,9 @@ def train_model(
     random_state=42,
     drop_columns=None,
     log_path="../prediction_model/experiment_logs/model_logs.jsonl",
-    notes=""
+    notes="",
+    params=None,
+    registry_dir=registry.DEFAULT_REGISTRY
 ):
     """
     Trains a classifier to predict the upgrade label.
@@ -58,9 +66,11 @@ def train_model(
         model_name (str): Identifier for the model version.
         test_size (float): Fraction of data to use for test set.
         random_state (int): Seed for reproducibility.
-        drop_columns (list): Optional list of columns to exclude from features.
+        drop_columns (list): Columns to exclude from features (default DEFAULT_DROP_COLUMNS, if present).
         log_path (str): File path for logging performance.
         notes (str): Description of what’s special about this model run.
+        params (dict): Optional XGBoost hyperparameters overriding the defaults (e.g. tune_model's best_params).
+        registry_dir (str): Model registry the trained model is saved to as a new version of model_name.
 
     Returns:
         model: Trained model object
@@ -69,10 +79,9 @@ def train_model(
     """
 
     # Step 1: Feature/target split
-    if drop_columns is None:
-        drop_columns = ["player_id", "player_name", "is_hitter", "new_overall", "overall_rating", "playerId", target]
-
-    X = df.drop(columns=drop_columns)
+    # Same default as tune_model, so tuned hyperparameters are scored on the features trained on
+    drop_columns = DEFAULT_DROP_COLUMNS + [target] if drop_columns is None else drop_columns
+    X = df.drop(columns=[col for col in drop_columns if col in df.columns])
     y = df[target]
 
     features = X.columns.tolist()
@@ -83,13 +92,14 @@ def train_model(
     )
 
     # Step 3: Initialize and train model
-    model = XGBClassifier(
-        n_estimators=100,
-        max_depth=5,
-        learning_rate=0.1,
-        eval_metric="mlogloss",
-        random_state=random_state
-    )
+    model = XGBClassifier(**{
+        "n_estimators": 100,
+        "max_depth": 5,
+        "learning_rate": 0.1,
+        "eval_metric": "mlogloss",
+        "random_state": random_state,
+        **(params or {})
+    })
     
     # Save the model's hyperparameters
     hyperparameters = model.get_params()
@@ -111,13 +121,127 @@ def train_model(
     metrics = {"accuracy": acc, "f1_score": f1}
     log_model_performance(log_path=log_path, model_name=model_name, metrics=metrics, features=features, hyperparameters=hyperparameters, notes=notes)
 
-    model_dir = "saved_models"
-    os.makedirs(model_dir, exist_ok=True)
-
-    model_path = os.path.join(model_dir, f"{model_name}.joblib")
-    joblib.dump(model, model_path)
+    model_path = registry.save_model(
+        model, model_name, X_train, metrics=metrics, params=hyperparameters, target=target, notes=notes, registry_dir=registry_dir
+    )
 
     print(f"💾 Model saved to {model_path}")
 
     return model, X_train, X_test, y_train, y_test, y_pred
 
+
+# -----------------------------
+# Hyperparameter search with k-fold CV
+# -----------------------------
+DEFAULT_PARAM_GRID = {
+    "max_depth": [3, 4, 5, 6],
+    "learning_rate": [0.03, 0.1, 0.3],
+    "min_child_weight": [1, 3],
+    "subsample": [0.8, 1.0],
+    "colsample_bytree": [0.8, 1.0],
+}
+_cv_data = {}
+
+def _init_cv_worker(X, y, folds):
+    # Each worker process receives the data once instead of once per trial
+    _cv_data.update(X=X, y=y, folds=folds)
+
+def _run_trial(params, max_estimators, early_stopping_rounds, random_state):
+    """
+    Cross-validates one parameter set; early stopping picks the tree count per fold.
+    """
+    X, y, folds = _cv_data["X"], _cv_data["y"], _cv_data["folds"]
+    started = time.perf_counter()
+    scores = {"accuracy": [], "f1_score": [], "log_loss": [], "best_iteration": []}
+    for train_idx, valid_idx in folds:
+        model = XGBClassifier(
+            n_estimators=max_estimators,
+            tree_method="hist",
+            eval_metric="logloss",
+            early_stopping_rounds=early_stopping_rounds,
+            random_state=random_state,
+            n_jobs=1,
+            **params
+        )
+        model.fit(X.iloc[train_idx], y.iloc[train_idx], eval_set=[(X.iloc[valid_idx], y.iloc[valid_idx])], verbose=False)
+        proba = model.predict_proba(X.iloc[valid_idx])[:, 1]
+        y_valid = y.iloc[valid_idx]
+        scores["accuracy"].append(accuracy_score(y_valid, proba >= 0.5))
+        scores["f1_score"].append(f1_score(y_valid, proba >= 0.5, average="weighted"))
+        scores["log_loss"].append(log_loss(y_valid, proba, labels=[0, 1]))
+        scores["best_iteration"].append(model.best_iteration)
+    return params, scores, time.perf_counter() - started
+
+def tune_model(
+    df,
+    target="upgrade_label",
+    model_name="XGBoost_tuned",
+    param_grid=None,
+    n_iter=None,
+    cv=5,
+    max_estimators=500,
+    early_stopping_rounds=20,
+    workers=None,
+    random_state=42,
+    drop_columns=None,
+    log_path="../prediction_model/experiment_logs/model_logs.jsonl",
+    notes=""
+):
+    """
+    Searches XGBoost hyperparameters with stratified k-fold CV, one trial per process.
+
+    Parameters:
+        df (pd.DataFrame): Input dataframe with features and target.
+        target (str): Name of the target column.
+        model_name (str): Prefix for the logged trial names.
+        param_grid (dict): Parameter name -> candidate values (default DEFAULT_PARAM_GRID).
+        n_iter (int): Random search over this many samples of the grid (None = full grid).
+        cv (int): Number of folds.
+        max_estimators (int): Tree cap; early stopping on each validation fold picks the count.
+        early_stopping_rounds (int): Rounds without logloss improvement before stopping.
+        workers (int): Worker processes (default: all cores).
+        random_state (int): Seed for the folds, the sampler and the models.
+        drop_columns (list): Columns to exclude from features (default DEFAULT_DROP_COLUMNS, if present).
+        log_path (str): Every trial is logged here with its CV scores and wall time.
+        notes (str): Description of the search.
+
+    Returns:
+        best_params (dict): Best parameters by mean log loss, with n_estimators set from early stopping
+            (pass to train_model(params=...)).
+        results (pd.DataFrame): One row per trial, best first.
+    """
+    drop_columns = DEFAULT_DROP_COLUMNS + [target] if drop_columns is None else drop_columns
+    X = df.drop(columns=[col for col in drop_columns if col in df.columns])
+    y = df[target]
+    features = X.columns.tolist()
+
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(X, y))
+    grid = param_grid or DEFAULT_PARAM_GRID
+    candidates = list(ParameterSampler(grid, n_iter=n_iter, random_state=random_state) if n_iter else ParameterGrid(grid))
+    print(f"🔎 {len(candidates)} candidates x {cv} folds")
+
+    rows, trials = [], []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_cv_worker, initargs=(X, y, folds)) as pool:
+        futures = [pool.submit(_run_trial, params, max_estimators, early_stopping_rounds, random_state) for params in candidates]
+        for trial, future in enumerate(as_completed(futures)):
+            params, scores, wall_time = future.result()
+            metrics = {name: float(np.mean(values)) for name, values in scores.items()}
+            metrics.update({f"{name}_std": float(np.std(values)) for name, values in scores.items() if name != "best_iteration"})
+            metrics["wall_time_s"] = round(wall_time, 3)
+            log_model_performance(
+                log_path=log_path, model_name=f"{model_name}_trial{trial}", metrics=metrics, features=features,
+                hyperparameters={**params, "tree_method": "hist", "cv": cv, "max_estimators": max_estimators,
+                                 "early_stopping_rounds": early_stopping_rounds},
+                notes=notes
+            )
+            rows.append({**params, **metrics})
+            trials.append((metrics["log_loss"], params, metrics))
+
+    results = pd.DataFrame(rows).sort_values("log_loss").reset_index(drop=True)
+    _, params, best = min(trials, key=lambda trial: trial[0])
+    best_params = {**params, "tree_method": "hist", "n_estimators": max(1, int(round(best["best_iteration"])) + 1)}
+
+    print(f"✅ Best CV log loss: {best['log_loss']:.4f} | accuracy: {best['accuracy']:.4f} | F1: {best['f1_score']:.4f}")
+    print(f"⏱️ {len(candidates)} trials in {time.perf_counter() - started:.1f}s")
+    return best_params, results
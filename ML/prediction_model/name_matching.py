@@ -0,0 +1,165 @@
+import fcntl
+import logging
+import os
+import re
+import tempfile
+from collections import defaultdict
+from difflib import SequenceMatcher
+import pandas as pd
+from prediction_model.logs import timed
+from prediction_model.preprocess import normalize_name
+
+logger = logging.getLogger(__name__)
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+FUZZY_THRESHOLD = 0.85
+CROSSWALK_COLUMNS = ["player_id", "playerId", "player_name", "method", "score"]
+DEFAULT_CROSSWALK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "player_crosswalk.csv")
+
+_PUNCTUATION = re.compile(r"[.'`]")
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+# -----------------------------
+# Name keys
+# -----------------------------
+def name_key(name) -> str:
+    """
+    Accent-, punctuation- and suffix-insensitive key: 'Luis García Jr.' -> 'luis garcia',
+    'J.D. Martinez' -> 'jd martinez', 'Encarnacion-Strand' -> 'encarnacion strand'.
+    """
+    tokens = _SEPARATORS.sub(" ", _PUNCTUATION.sub("", normalize_name(name))).split()
+    while len(tokens) > 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+def name_keys(names: pd.Series) -> pd.Series:
+    """
+    name_key over a column, computed once per distinct name.
+    """
+    uniques = names.dropna().unique()
+    return names.map(dict(zip(uniques, map(name_key, uniques)))).fillna("")
+
+def _block_tokens(key: str) -> list[str]:
+    # Surname tokens (everything after the first name); single letters are initials
+    return [token for token in key.split()[1:] if len(token) > 1]
+
+def _token_sort(key: str) -> str:
+    return " ".join(sorted(key.split()))
+
+# -----------------------------
+# FanGraphs name index
+# -----------------------------
+class NameIndex:
+    """
+    Resolves card names to FanGraphs playerIds.
+
+    Exact keys are a dict lookup. Misses fall back to a token-sort similarity match,
+    but only against players sharing a surname token, so the fuzzy step stays cheap
+    and never pairs two unrelated players who merely look alike.
+    """
+    def __init__(self, fg_df: pd.DataFrame, name_col: str = "Name", id_col: str = "playerId"):
+        self.exact = defaultdict(set)
+        self.blocks = defaultdict(set)
+        self.sorted_keys = {}
+        for key, player_id in zip(name_keys(fg_df[name_col]), fg_df[id_col]):
+            if not key or pd.isnull(player_id):
+                continue
+            self.exact[key].add(player_id)
+            self.sorted_keys[key] = _token_sort(key)
+            for token in _block_tokens(key):
+                self.blocks[token].add(key)
+
+    def resolve(self, name, threshold: float = FUZZY_THRESHOLD):
+        """
+        Returns (playerId, score, method) with method 'exact' or 'fuzzy', or
+        (None, 0.0, None) when there is no unambiguous match.
+        """
+        key = name_key(name)
+        ids = self.exact.get(key)
+        if ids:
+            return (next(iter(ids)), 1.0, "exact") if len(ids) == 1 else (None, 0.0, None)
+
+        candidates = set()
+        for token in _block_tokens(key):
+            candidates |= self.blocks.get(token, set())
+        query = _token_sort(key)
+        scored = sorted(
+            ((SequenceMatcher(None, query, self.sorted_keys[c]).ratio(), c) for c in candidates),
+            reverse=True,
+        )
+        if not scored or scored[0][0] < threshold:
+            return None, 0.0, None
+        best_score, best_key = scored[0]
+        if len(self.exact[best_key]) > 1 or (len(scored) > 1 and scored[1][0] == best_score):
+            return None, 0.0, None
+        return next(iter(self.exact[best_key])), round(best_score, 3), "fuzzy"
+
+# -----------------------------
+# uuid <-> playerId crosswalk
+# -----------------------------
+def load_crosswalk(path: str) -> pd.DataFrame:
+    if path and os.path.exists(path):
+        return pd.read_csv(path, dtype={"player_id": str, "playerId": "Int64"})
+    return pd.DataFrame(columns=CROSSWALK_COLUMNS)
+
+def save_crosswalk(path: str, crosswalk: pd.DataFrame):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        crosswalk.drop_duplicates(subset="player_id", keep="last").to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def append_crosswalk(path: str, new: pd.DataFrame):
+    """
+    Adds links to the crosswalk file. Parallel dataset builds share one file, so the
+    read-merge-write runs under a lock and re-reads whatever other workers saved.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a+") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            crosswalk = load_crosswalk(path)
+            save_crosswalk(path, new if crosswalk.empty else pd.concat([crosswalk, new], ignore_index=True))
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+@timed(logger)
+def match_players(attr_df: pd.DataFrame, fg_df: pd.DataFrame, name_col: str = "Name", id_col: str = "playerId", crosswalk_path: str = None) -> pd.DataFrame:
+    """
+    Matches every card in attr_df (player_id, player_name) to a FanGraphs playerId.
+
+    Cards already in the crosswalk reuse their stored id; the rest go through NameIndex,
+    and new matches are appended to the crosswalk file when a path is given.
+
+    Returns:
+        pd.DataFrame: player_id, playerId (nullable), method ('crosswalk', 'exact', 'fuzzy' or None), score.
+    """
+    crosswalk = load_crosswalk(crosswalk_path)
+    known = dict(zip(crosswalk["player_id"], crosswalk["playerId"]))
+    fg_ids = set(fg_df[id_col].dropna())
+
+    index = None
+    rows, new_links = [], []
+    for uuid, name in zip(attr_df["player_id"], attr_df["player_name"]):
+        player_id = known.get(uuid)
+        if player_id is not None and not pd.isnull(player_id):
+            rows.append((uuid, player_id if player_id in fg_ids else None, "crosswalk", 1.0))
+            continue
+        if index is None:
+            index = NameIndex(fg_df, name_col=name_col, id_col=id_col)
+        player_id, score, method = index.resolve(name)
+        rows.append((uuid, player_id, method, score))
+        if player_id is not None:
+            new_links.append((uuid, player_id, name, method, score))
+
+    if crosswalk_path and new_links:
+        append_crosswalk(crosswalk_path, pd.DataFrame(new_links, columns=CROSSWALK_COLUMNS))
+
+    matches = pd.DataFrame(rows, columns=["player_id", id_col, "method", "score"])
+    matches[id_col] = matches[id_col].astype("Int64")
+    return matches
@@ -0,0 +1,262 @@
+import ast
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import logging
+import os
+import sys
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+from prediction_model.logs import stage_timer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline_cache")
+
+# -----------------------------
+# Content hashing
+# -----------------------------
+def _update_hash(h, value):
+    """
+    Feeds a stage input into the hash by content: frames by their values, columns and
+    dtypes, containers recursively, everything else by repr.
+    """
+    if isinstance(value, pd.DataFrame):
+        h.update(b"frame")
+        h.update(repr((list(value.columns), [str(d) for d in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(b"series")
+        h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            _update_hash(h, item)
+    elif isinstance(value, dict):
+        h.update(f"dict:{len(value)}".encode())
+        for key in sorted(value, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, value[key])
+    else:
+        h.update(repr(value).encode())
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def hash_dir(path: str) -> str:
+    """
+    Manifest hash of a directory: each file's name, size and mtime. Changes whenever a
+    file is added, removed or rewritten, without reading any contents. A directory that
+    doesn't exist yet hashes as empty.
+    """
+    h = hashlib.sha256()
+    if os.path.isdir(path):
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.is_file():
+                stat = entry.stat()
+                h.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+_code_hashes = {}
+PACKAGE = "prediction_model"
+
+def _module_file(name: str):
+    module = sys.modules.get(name)
+    if module is None:
+        module = importlib.import_module(name)
+    return getattr(module, "__file__", None)
+
+def _package_imports(source: str) -> set:
+    """
+    prediction_model modules named by the import statements in source (absolute or
+    relative). Names in docstrings and comments don't count.
+    """
+    modules = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            # The package is flat, so a relative import is always from prediction_model
+            base = ".".join(filter(None, [PACKAGE if node.level else None, node.module]))
+            # `from prediction_model import fangraphs` imports a module, `... import timed` doesn't
+            names = [base] + [f"{base}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        for name in names:
+            if name.startswith(f"{PACKAGE}.") and name.count(".") == 1 and importlib.util.find_spec(name) is not None:
+                modules.add(name)
+    return modules
+
+def code_version(func) -> str:
+    """
+    Hash of the source file defining func plus every prediction_model module it imports
+    (transitively), so editing a stage or a helper it relies on invalidates that stage
+    and everything downstream of it.
+    """
+    path = _module_file(func.__module__)
+    if path is None:
+        return hashlib.sha256(inspect.getsource(func).encode()).hexdigest()
+
+    h = hashlib.sha256()
+    seen, pending = set(), [path]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        mtime = os.path.getmtime(path)
+        cached = _code_hashes.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "r", encoding="utf-8") as f:
+                source = f.read()
+            imports = [_module_file(name) for name in sorted(_package_imports(source))]
+            cached = _code_hashes[path] = (mtime, hashlib.sha256(source.encode()).hexdigest(), [i for i in imports if i])
+        h.update(cached[1].encode())
+        pending.extend(cached[2])
+    return h.hexdigest()
+
+# -----------------------------
+# Memoizing stage runner
+# -----------------------------
+class Pipeline:
+    """
+    Runs preprocessing stages and memoizes each result on disk under a key built from
+    the stage name, its code version, its inputs and any file dependencies.
+
+    A stage only recomputes when one of those changes; since outputs feed the next
+    stage's key, a change propagates downstream and nowhere else.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, enabled: bool = True, verbose: bool = True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.verbose = verbose
+        self.stats = {"hits": 0, "misses": 0}
+
+    def key(self, name: str, func, args, kwargs, deps=()) -> str:
+        h = hashlib.sha256()
+        h.update(name.encode())
+        h.update(code_version(func).encode())
+        _update_hash(h, args)
+        _update_hash(h, kwargs)
+        for path in deps:
+            h.update((hash_file(path) if os.path.isfile(path) else hash_dir(path)).encode())
+        return h.hexdigest()
+
+    def _path(self, name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, name, f"{key[:32]}.joblib")
+
+    def _state(self, paths) -> str:
+        return hashlib.sha256("".join(hash_file(p) if os.path.isfile(p) else hash_dir(p) for p in paths).encode()).hexdigest()
+
+    def run(self, name: str, func, *args, deps=(), state=(), refresh: bool = False, **kwargs):
+        """
+        Returns func(*args, **kwargs), loading it from the cache when the key matches.
+
+        Args:
+            name (str): Stage name (also the cache sub-directory).
+            func: The stage function.
+            deps (list[str]): Files or directories the stage reads; a file's contents and a
+                directory's manifest (see hash_dir) are part of the key.
+            state (list[str]): Files or directories the stage reads and also writes (e.g. a
+                cache it fills). They are fingerprinted after the stage runs, and a cached result
+                is used only while that still matches, so the stage's own writes don't invalidate it.
+            refresh (bool): Recompute and overwrite even on a cache hit.
+        """
+        if not self.enabled:
+            return func(*args, **kwargs)
+
+        level = logging.INFO if self.verbose else logging.DEBUG
+        path = self._path(name, self.key(name, func, args, kwargs, deps))
+        state_path = path[:-len(".joblib")] + ".state"
+        fresh = not state or (os.path.exists(state_path) and joblib.load(state_path) == self._state(state))
+        if not refresh and os.path.exists(path) and fresh:
+            self.stats["hits"] += 1
+            with stage_timer(logger, name, level, cached=True):
+                return joblib.load(path)
+
+        self.stats["misses"] += 1
+        with stage_timer(logger, name, level, cached=False):
+            # Several stages add columns to their inputs in place; keep callers' frames untouched
+            args = [a.copy() if isinstance(a, pd.DataFrame) else a for a in args]
+            result = func(*args, **kwargs)
+            self._write(path, result)
+            if state:
+                self._write(state_path, self._state(state))
+        return result
+
+    def _write(self, path: str, result):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(result, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def stage(self, name: str = None, deps=(), state=()):
+        """
+        Decorator form of run(): @pipeline.stage("features") def build(df): ...
+        """
+        def decorate(func):
+            def wrapper(*args, **kwargs):
+                return self.run(name or func.__name__, func, *args, deps=deps, state=state, **kwargs)
+            wrapper.__wrapped__ = func
+            return wrapper
+        return decorate
+
+# -----------------------------
+# Notebook flow (data_extraction.ipynb) as cached stages
+# -----------------------------
+def build_hitter_dataset(update_id: int, attribute_cache_dir: str, fg_lhp_csv: str, fg_rhp_csv: str, pipeline: Pipeline = None, features: bool = True, crosswalk_path: str = None) -> pd.DataFrame:
+    """
+    Runs the hitter flow from the data extraction notebook with every stage memoized.
+
+    Args:
+        update_id (int): Roster update id.
+        attribute_cache_dir (str): Pre-update attribute cache for that update.
+        fg_lhp_csv, fg_rhp_csv (str): FanGraphs split CSVs for the update's window.
+        pipeline (Pipeline): Runner to use (defaults to one on DEFAULT_CACHE_DIR).
+        features (bool): Also add the make_discrepancy_features columns.
+        crosswalk_path (str): uuid <-> playerId crosswalk reused and extended by the FanGraphs
+            merge (default name_matching.DEFAULT_CROSSWALK_PATH).
+
+    Returns:
+        pd.DataFrame: One row per hitter, ready for train_model.
+    """
+    from prediction_model.data_loader import load_player_attributes, load_roster_update_data
+    from prediction_model.model import make_discrepancy_features
+    from prediction_model.name_matching import DEFAULT_CROSSWALK_PATH
+    from prediction_model.preprocess import (
+        add_fg_missing_indicators, drop_duplicate_players, drop_players_without_fg, merge_and_split_roster_update,
+        merge_attribute_roster, merge_fangraphs_data, merge_lhp_rhp, split_attribute_data,
+    )
+
+    p = pipeline or Pipeline()
+    crosswalk_path = crosswalk_path or DEFAULT_CROSSWALK_PATH
+    update_df = p.run("roster_update", load_roster_update_data, update_id)
+    # Reruns when the attribute cache changes, but not because the stage itself filled it
+    attribute_df = p.run("player_attributes", load_player_attributes, update_df["player_id"].tolist(), attribute_cache_dir, state=[attribute_cache_dir])
+    hitter_attributes, _ = p.run("split_attributes", split_attribute_data, attribute_df)
+    hitter_changes, _ = p.run("split_roster_update", merge_and_split_roster_update, update_df, attribute_df)
+    hitter_df = p.run("merge_attribute_roster", merge_attribute_roster, hitter_attributes, hitter_changes)
+    fg_df = p.run("merge_lhp_rhp", merge_lhp_rhp, fg_lhp_csv, fg_rhp_csv, deps=[fg_lhp_csv, fg_rhp_csv])
+    df = p.run("merge_fangraphs", merge_fangraphs_data, hitter_df, fg_df, crosswalk_path=crosswalk_path, state=[crosswalk_path])
+    df = p.run("drop_duplicates", drop_duplicate_players, df)
+    df = p.run("drop_missing_fg", drop_players_without_fg, df)
+    df = p.run("missing_indicators", add_fg_missing_indicators, df)
+    if features:
+        df = p.run("discrepancy_features", make_discrepancy_features, df)
+    return df
@@ -1,6 +1,11 @@
+import logging
 import pandas as pd
 import unicodedata
-from prediction_model.data_loader import load_player_attributes, load_roster_update_data
+from prediction_model.fangraphs import load_fg_splits
+from prediction_model.data_loader import HITTER_COLUMNS, PITCHER_COLUMNS, load_player_attributes, load_roster_update_data
+from prediction_model.logs import log_event
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------
 # Split up player attribute data by pitcher and hitter
@@ -12,11 +17,14 @@ def split_attribute_data(attribute_data: pd.DataFrame):
     Returns:
         hitters_df (pd.DataFrame): Data for hitters
         pitchers_df (pd.DataFrame): Data for pitchers
+
+    Columns come from the attribute schema in data_loader; load_player_attributes(..., split=True)
+    produces the same split directly while building the dataset.
     """
-    hitters_df = attribute_data[attribute_data["is_hitter"] == True].copy()
-    hitters_df = hitters_df.drop(columns=["hits_per_9", "k_per_9", "bb_per_9", "hr_per_9"])
-    pitchers_df = attribute_data[attribute_data["is_hitter"] == False].copy()
-    pitchers_df = pitchers_df.drop(columns=["contact_left", "contact_right", "power_left", "power_right", "vision", "discipline"])
+    hitter_only = [c for c in HITTER_COLUMNS if c not in PITCHER_COLUMNS]
+    pitcher_only = [c for c in PITCHER_COLUMNS if c not in HITTER_COLUMNS]
+    hitters_df = attribute_data[attribute_data["is_hitter"] == True].drop(columns=pitcher_only)
+    pitchers_df = attribute_data[attribute_data["is_hitter"] == False].drop(columns=hitter_only)
     return hitters_df, pitchers_df
 
 
@@ -81,38 +89,14 @@ def merge_attribute_roster(attribute_df: pd.DataFrame, roster_df: pd.DataFrame):
 # Merge LHP and RHP FanGraph Data
 # -----------------------------
 def merge_lhp_rhp(fangraphsLHP_csv_path, fangraphsRHP_csv_path, key="Name", id_col="playerId"):
-    
-    fg_lhp = pd.read_csv(fangraphsLHP_csv_path)
-    fg_rhp = pd.read_csv(fangraphsRHP_csv_path)
-
-    # Drop Unnecessary Columns
-    fg_lhp = clean_fg_data(fg_lhp)
-    fg_rhp = clean_fg_data(fg_rhp)
-
-    # Prefix columns
-    fg_lhp = fg_lhp.add_prefix("lhp_")
-    fg_rhp = fg_rhp.add_prefix("rhp_")
-
-    # Restore merge keys
-    fg_lhp[key] = fg_lhp[f"lhp_{key}"]
-    fg_rhp[key] = fg_rhp[f"rhp_{key}"]
-    fg_lhp[id_col] = fg_lhp[f"lhp_{id_col}"]
-    fg_rhp[id_col] = fg_rhp[f"rhp_{id_col}"]
-
-    # Merge
-    merged = pd.merge(fg_lhp, fg_rhp, on=[key, id_col], how="outer")
-
-    # Drop redundant columns
-    cols_to_drop = [f"lhp_{key}", f"rhp_{key}", f"lhp_{id_col}", f"rhp_{id_col}"]
-    merged = merged.drop(columns=[col for col in cols_to_drop if col in merged.columns])
-
-    # Reorder columns
-    cols = merged.columns.tolist()
-    first_cols = [id_col, key]
-    remaining_cols = [col for col in cols if col not in first_cols]
-    merged = merged[first_cols + remaining_cols]
-
-    return merged
+    """
+    Loads the LHP and RHP FanGraphs splits into one wide frame: id_col, key, then the
+    lhp_/rhp_ prefixed stats. Only the needed columns are read, with compact dtypes
+    (see fangraphs.load_fg_splits).
+    """
+    merged = load_fg_splits({"lhp_": fangraphsLHP_csv_path, "rhp_": fangraphsRHP_csv_path})
+    merged = merged.rename(columns={"Name": key, "playerId": id_col})
+    return merged[[id_col, key] + [col for col in merged.columns if col not in (id_col, key)]]
 
 
 # -----------------------------
@@ -131,41 +115,61 @@ def normalize_name(name):
 # -----------------------------
 # Merge Fangraph Data with Merged Attribute and Roster Update Data
 # -----------------------------
-def merge_fangraphs_data(attr_df, fg_df, name_col="Name"):
+def merge_fangraphs_data(attr_df, fg_df, name_col="Name", id_col="playerId", crosswalk_path=None):
     """
-    Merges Fangraphs stats into the attribute dataframe using player name.
+    Merges Fangraphs stats into the attribute dataframe.
+    Cards are matched to FanGraphs playerIds by name (see name_matching: exact key lookup,
+    then a surname-blocked fuzzy match), and the stats are joined on playerId.
     Also logs how many players matched and how many did not.
 
     Parameters:
         attr_df (pd.DataFrame): The main player attribute dataframe.
-        fangraphs_csv_path (str): Path to the Fangraphs CSV file.
-        name_col (str): The column in the CSV that contains player names (default 'Name').
+        fg_df (pd.DataFrame): FanGraphs stats (e.g. from merge_lhp_rhp).
+        name_col (str): The column in fg_df that contains player names (default 'Name').
+        id_col (str): The FanGraphs id column (default 'playerId').
+        crosswalk_path (str): Optional uuid <-> playerId CSV; stored matches are reused and new ones saved.
 
     Returns:
         pd.DataFrame: Merged dataframe.
     """
+    from prediction_model.name_matching import match_players
 
-    # Sanitize names
-    fg_df["normalized_name"] = fg_df[name_col].apply(normalize_name)
-    attr_df["normalized_name"] = attr_df["player_name"].apply(normalize_name)
+    matches = match_players(attr_df, fg_df, name_col=name_col, id_col=id_col, crosswalk_path=crosswalk_path)
 
-    # Merge
-    merged = attr_df.merge(fg_df.drop(columns=[name_col], errors="ignore"), on="normalized_name", how="left", indicator=True)
+    # Join on playerId
+    merged = attr_df.assign(**{id_col: matches[id_col].to_numpy()})
+    fg_df = fg_df.drop(columns=[name_col], errors="ignore").astype({id_col: "Int64"})
+    merged = merged.merge(fg_df, on=id_col, how="left")
 
     # Log results
     total = len(merged)
-    matched = (merged["_merge"] == "both").sum()
-    unmatched = total - matched
-    print(f"[merge_fangraphs_data] Total players: {total} | Matched: {matched} | Unmatched: {unmatched}")
-
-    unmatched_df = merged[merged["_merge"] == "left_only"]
-    print("Unmatched player names:", unmatched_df["player_name"].unique())
-
-    # Clean up
-    merged.drop(columns=["normalized_name", "_merge"], inplace=True, errors="ignore")
+    methods = matches["method"].value_counts().to_dict()
+    matched = int(matches[id_col].notna().sum())
+    log_event(logger, "merge_fangraphs_data", total=total, matched=matched, unmatched=total - matched, methods=methods)
+    log_event(logger, "unmatched_players", logging.DEBUG, names=attr_df.loc[matches[id_col].isna().to_numpy(), "player_name"].unique().tolist())
 
     return merged
 
 
+# -----------------------------
+# Final cleanup before modeling
+# -----------------------------
+def drop_duplicate_players(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop_duplicates(subset=["player_id"])
 
+def drop_players_without_fg(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drops players with no FanGraphs stats in either split.
+    """
+    fg_cols = [col for col in df.columns if col.startswith("lhp_") or col.startswith("rhp_")]
+    return df[~df[fg_cols].isnull().all(axis=1)].copy()
 
+def add_fg_missing_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the missing_lhp_stats/missing_rhp_stats flags and drops the OBP columns
+    (redundant with AVG and BB%).
+    """
+    from prediction_model.utility import add_missing_indicators
+    df = add_missing_indicators(df, "lhp_")
+    df = add_missing_indicators(df, "rhp_")
+    return df.drop(columns=[col for col in df.columns if col.endswith("_OBP")])
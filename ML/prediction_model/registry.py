@@ -0,0 +1,137 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+DEFAULT_REGISTRY = os.getenv(
+    "MLB_MODEL_REGISTRY", os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+)
+MODEL_FILE = "model.ubj"
+METADATA_FILE = "metadata.json"
+
+_VERSION_DIR = re.compile(r"^v(\d+)$")
+
+# -----------------------------
+# Versioned model registry: <registry>/<name>/v<N>/{model.ubj, metadata.json}
+# -----------------------------
+def list_versions(name: str, registry_dir: str = DEFAULT_REGISTRY) -> list[int]:
+    model_dir = os.path.join(registry_dir, name)
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(int(m[1]) for m in map(_VERSION_DIR.match, os.listdir(model_dir)) if m)
+
+def list_models(registry_dir: str = DEFAULT_REGISTRY) -> dict:
+    """
+    Returns {model name: [versions]} for everything in the registry.
+    """
+    if not os.path.isdir(registry_dir):
+        return {}
+    return {name: list_versions(name, registry_dir) for name in sorted(os.listdir(registry_dir)) if list_versions(name, registry_dir)}
+
+def save_model(model, name: str, X: pd.DataFrame, metrics: dict = None, params: dict = None, target: str = None, notes: str = "", registry_dir: str = DEFAULT_REGISTRY) -> str:
+    """
+    Stores a trained XGBoost model as the next version of `name`, in XGBoost's native
+    UBJ format next to its ordered feature schema (from X) and training metadata.
+
+    Returns:
+        str: The version directory.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    version = (list_versions(name, registry_dir) or [0])[-1] + 1
+    metadata = {
+        "name": name,
+        "version": version,
+        "created_at": datetime.now().isoformat(),
+        "features": list(X.columns),
+        "dtypes": {col: str(dtype) for col, dtype in X.dtypes.items()},
+        "target": target,
+        "params": _jsonable(params or {}),
+        "metrics": _jsonable(metrics or {}),
+        "notes": notes,
+        "xgboost_version": xgb.__version__,
+    }
+
+    # Write into a temp dir and rename it into place, so readers never see a half-written version
+    model_dir = os.path.join(registry_dir, name)
+    os.makedirs(model_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=model_dir, prefix=".tmp-")
+    try:
+        booster.save_model(os.path.join(tmp_dir, MODEL_FILE))
+        with open(os.path.join(tmp_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        version_dir = os.path.join(model_dir, f"v{version}")
+        os.rename(tmp_dir, version_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return version_dir
+
+def load_model(name: str, version: int = None, registry_dir: str = DEFAULT_REGISTRY) -> "RegisteredModel":
+    """
+    Returns a handle on one version of a model (latest by default). Only the metadata
+    is read here; the booster loads on first use.
+    """
+    versions = list_versions(name, registry_dir)
+    if not versions:
+        raise FileNotFoundError(f"No model named '{name}' in {registry_dir}")
+    version = versions[-1] if version is None else version
+    if version not in versions:
+        raise FileNotFoundError(f"Model '{name}' has no version {version} (available: {versions})")
+    return RegisteredModel(os.path.join(registry_dir, name, f"v{version}"))
+
+def _jsonable(values: dict) -> dict:
+    return {k: v.item() if isinstance(v, np.generic) else v for k, v in values.items() if isinstance(v, (str, int, float, bool, np.generic))}
+
+# -----------------------------
+# Loaded model handle
+# -----------------------------
+class RegisteredModel:
+    """
+    A registry version: metadata up front, booster loaded lazily. Inputs are aligned to
+    the stored feature order before scoring, so callers never have to know it.
+    """
+    def __init__(self, version_dir: str):
+        self.path = version_dir
+        with open(os.path.join(version_dir, METADATA_FILE), "r", encoding="utf-8") as f:
+            self.metadata = json.load(f)
+        self.name = self.metadata["name"]
+        self.version = self.metadata["version"]
+        self.features = self.metadata["features"]
+        self.dtypes = self.metadata["dtypes"]
+        self._booster = None
+
+    def __repr__(self):
+        return f"RegisteredModel({self.name!r}, version={self.version})"
+
+    @property
+    def booster(self) -> xgb.Booster:
+        if self._booster is None:
+            booster = xgb.Booster()
+            booster.load_model(os.path.join(self.path, MODEL_FILE))
+            self._booster = booster
+        return self._booster
+
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Selects the model's features in training order; missing ones become NaN.
+        """
+        return df.reindex(columns=self.features)
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Positive-class probability for every row of df, in one batched call.
+        """
+        return self.booster.inplace_predict(self.prepare(df))
+
+    def classifier(self):
+        """
+        The model as an sklearn-style XGBClassifier (e.g. for feature_importances_).
+        """
+        model = xgb.XGBClassifier()
+        model.load_model(os.path.join(self.path, MODEL_FILE))
+        return model
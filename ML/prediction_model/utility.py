@@ -1,4 +1,8 @@
+import logging
 import matplotlib.pyplot as plt
+from prediction_model.logs import log_event
+
+logger = logging.getLogger(__name__)
 
 def inspect_dataframe(df, id_col="player_id", name_col="player_name", drop_duplicates=False):
     """
@@ -92,12 +96,12 @@ def add_missing_indicators(df, prefix):
     """
     cols = [col for col in df.columns if col.startswith(prefix) and not col.endswith("_missing")]
     if not cols:
-        print(f"[add_missing_indicators] No columns found with prefix '{prefix}'")
+        log_event(logger, "add_missing_indicators", logging.WARNING, prefix=prefix, columns=[])
         return df
 
     missing_col_name = f"missing_{prefix.rstrip('_')}_stats"
     df[missing_col_name] = df[cols].isnull().all(axis=1).astype(int)
-    print(f"Columns used for '{prefix}': {cols}")
+    log_event(logger, "add_missing_indicators", logging.DEBUG, prefix=prefix, columns=cols)
 
 
     return df
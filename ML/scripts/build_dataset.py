@@ -0,0 +1,41 @@
+"""
+Builds the training table for a range of roster updates, one worker process per update.
+
+Examples (run from ML/):
+    python scripts/build_dataset.py --updates 11
+    python scripts/build_dataset.py --updates 5-11 --workers 4 --output data/training
+"""
+import argparse
+import time
+
+from prediction_model.dataset import DEFAULT_MANIFEST, build_training_set, load_manifest
+
+
+def parse_updates(value):
+    ids = []
+    for part in value.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            ids.extend(range(int(start), int(end) + 1))
+        else:
+            ids.append(int(part))
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a multi-roster-update training table.")
+    parser.add_argument("--updates", required=True, help="Update ids, e.g. '11', '5-11' or '3,5,7-9'")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Roster update manifest (default data/roster_updates.json)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default one per update)")
+    parser.add_argument("--output", default=None, help="Parquet dataset directory, partitioned by update_id")
+    args = parser.parse_args()
+
+    update_ids = parse_updates(args.updates)
+    start = time.perf_counter()
+    df = build_training_set(update_ids, load_manifest(args.manifest), workers=args.workers, output_path=args.output)
+    counts = df.groupby("update_id").size().to_dict() if not df.empty else {}
+    print(f"{len(df)} rows from {len(counts)}/{len(update_ids)} updates {counts} | {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Warms a player attribute cache directory (player_<uuid>.json files) and folds it into
+the columnar attributes.parquet store.
+
+Examples (run from ML/):
+    python scripts/fetch_and_cache.py --cache-dir data/caches/post-ru-6-13 --roster-update 11
+    python scripts/fetch_and_cache.py --cache-dir data/caches/live --uuids-file uuids.txt --workers 16 --rate-limit 10
+    python scripts/fetch_and_cache.py --cache-dir data/caches/pre-ru-6-13 --migrate-json
+"""
+import argparse
+import time
+
+from prediction_model.data_loader import load_roster_update_data, warm_player_cache, migrate_json_cache
+
+
+def read_uuids(path):
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm a player attribute cache directory.")
+    parser.add_argument("--cache-dir", required=True, help="Directory to write player_<uuid>.json files to")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--migrate-json", action="store_true", help="Only migrate existing JSON files into the columnar store")
+    source.add_argument("--uuids-file", help="Text file with one uuid per line")
+    source.add_argument("--roster-update", type=int, help="Roster update id; caches every player it changed")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetches (default 8)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Max requests per second (default unlimited)")
+    args = parser.parse_args()
+
+    if args.migrate_json:
+        start = time.perf_counter()
+        count = migrate_json_cache(args.cache_dir)
+        print(f"Migrated {count} players into the columnar store | {time.perf_counter() - start:.1f}s")
+        return
+
+    if args.uuids_file:
+        uuids = read_uuids(args.uuids_file)
+    else:
+        uuids = load_roster_update_data(args.roster_update)["player_id"].dropna().tolist()
+
+    start = time.perf_counter()
+    stats = warm_player_cache(uuids, args.cache_dir, workers=args.workers, rate_limit=args.rate_limit)
+    migrate_json_cache(args.cache_dir)
+    print(f"{len(uuids)} uuids | already cached: {stats['cached']} | fetched: {stats['fetched']} "
+          f"| failed: {stats['failed']} | {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
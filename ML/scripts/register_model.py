@@ -0,0 +1,57 @@
+"""
+Imports pickled models (saved_models/*.joblib) into the model registry, so they can be
+served without unpickling. Metrics and notes come from the experiment log when present.
+
+Examples (run from ML/):
+    python scripts/register_model.py notebooks/saved_models/XGBoost_v4_new_features.joblib
+    python scripts/register_model.py notebooks/saved_models/*.joblib --log prediction_model/experiment_logs/model_logs.jsonl
+"""
+import argparse
+import json
+import os
+
+import joblib
+import pandas as pd
+
+from prediction_model import registry
+
+# XGBoost feature_types -> pandas dtype for the stored schema
+FEATURE_DTYPES = {"int": "int64", "i": "bool", "float": "float64", "q": "float64", "c": "category"}
+
+
+def read_log(path):
+    entries = {}
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[entry["model"]] = entry
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import joblib models into the model registry.")
+    parser.add_argument("paths", nargs="+", help="joblib model files")
+    parser.add_argument("--registry-dir", default=registry.DEFAULT_REGISTRY, help="Registry directory (default ML/models)")
+    parser.add_argument("--log", default=os.path.join("prediction_model", "experiment_logs", "model_logs.jsonl"), help="Experiment log for metrics/notes")
+    args = parser.parse_args()
+
+    log = read_log(args.log)
+    for path in args.paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        model = joblib.load(path)
+        booster = model.get_booster()
+        types = booster.feature_types or ["float"] * len(booster.feature_names)
+        schema = pd.DataFrame({f: pd.Series(dtype=FEATURE_DTYPES.get(t, "float64")) for f, t in zip(booster.feature_names, types)})
+        entry = log.get(name, {})
+        version_dir = registry.save_model(
+            model, name, schema, metrics=entry.get("metrics"), params=model.get_params(),
+            target="upgrade_label", notes=entry.get("notes", f"Imported from {os.path.basename(path)}"),
+            registry_dir=args.registry_dir,
+        )
+        print(f"{path} -> {version_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional
+
+from app.models.investment_models import Investment
+from app.models.player import Player
+
+# -----------------------------
+# SQLite storage for investments and card metadata
+# -----------------------------
+DB_PATH = os.getenv("MLB_MARKET_DB", "data/market.db")
+POOL_SIZE = int(os.getenv("MLB_MARKET_DB_POOL_SIZE", "4"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    uuid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    overall INTEGER NOT NULL,
+    series TEXT,
+    team TEXT,
+    img TEXT
+);
+
+CREATE TABLE IF NOT EXISTS investments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid TEXT,
+    name TEXT NOT NULL,
+    overall INTEGER NOT NULL,
+    series TEXT,
+    buy_price INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    total_invested INTEGER NOT NULL,
+    qsv INTEGER NOT NULL,
+    risk INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_investments_uuid ON investments (uuid);
+CREATE INDEX IF NOT EXISTS idx_investments_name ON investments (name);
+
+-- Running portfolio totals, maintained with deltas on every insert/update/delete
+CREATE TABLE IF NOT EXISTS portfolio_aggregates (
+    dimension TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    positions INTEGER NOT NULL DEFAULT 0,
+    total_quantity INTEGER NOT NULL DEFAULT 0,
+    total_stubs_invested INTEGER NOT NULL DEFAULT 0,
+    total_qsv INTEGER NOT NULL DEFAULT 0,
+    total_risk INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, bucket)
+);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement cache reuses
+# the compiled (prepared) statement on every call
+INVESTMENT_COLUMNS = "id, uuid, name, overall, series, buy_price, quantity, total_invested, qsv, risk, created_at, updated_at"
+INSERT_INVESTMENT = """
+INSERT INTO investments (uuid, name, overall, series, buy_price, quantity, total_invested, qsv, risk, created_at, updated_at)
+VALUES (:uuid, :name, :overall, :series, :buy_price, :quantity, :total_invested, :qsv, :risk, :created_at, :updated_at)
+"""
+UPDATE_INVESTMENT = """
+UPDATE investments
+SET buy_price = :buy_price, quantity = :quantity, total_invested = :total_invested,
+    qsv = :qsv, risk = :risk, updated_at = :updated_at
+WHERE id = :id
+"""
+SELECT_INVESTMENT_BY_ID = f"SELECT {INVESTMENT_COLUMNS} FROM investments WHERE id = ?"
+SELECT_INVESTMENT_BY_NAME = f"SELECT {INVESTMENT_COLUMNS} FROM investments WHERE name = ? ORDER BY id LIMIT 1"
+SELECT_INVESTMENTS_BY_UUID = f"SELECT {INVESTMENT_COLUMNS} FROM investments WHERE uuid = ? ORDER BY id"
+SELECT_ALL_INVESTMENTS = f"SELECT {INVESTMENT_COLUMNS} FROM investments ORDER BY id"
+DELETE_INVESTMENT = "DELETE FROM investments WHERE id = ?"
+UPSERT_PLAYER = """
+INSERT INTO players (uuid, name, overall, series, team, img)
+VALUES (:uuid, :name, :overall, :series, :team, :img)
+ON CONFLICT (uuid) DO UPDATE SET
+    name = excluded.name, overall = excluded.overall, series = excluded.series,
+    team = excluded.team, img = excluded.img
+"""
+SELECT_PLAYER = "SELECT uuid, name, overall, series, team, img FROM players WHERE uuid = ?"
+APPLY_AGGREGATE_DELTA = """
+INSERT INTO portfolio_aggregates (dimension, bucket, positions, total_quantity, total_stubs_invested, total_qsv, total_risk)
+VALUES (:dimension, :bucket, :positions, :total_quantity, :total_stubs_invested, :total_qsv, :total_risk)
+ON CONFLICT (dimension, bucket) DO UPDATE SET
+    positions = positions + excluded.positions,
+    total_quantity = total_quantity + excluded.total_quantity,
+    total_stubs_invested = total_stubs_invested + excluded.total_stubs_invested,
+    total_qsv = total_qsv + excluded.total_qsv,
+    total_risk = total_risk + excluded.total_risk
+"""
+SELECT_AGGREGATES = "SELECT dimension, bucket, positions, total_quantity, total_stubs_invested, total_qsv, total_risk FROM portfolio_aggregates"
+COUNT_AGGREGATES = "SELECT COUNT(*) FROM portfolio_aggregates"
+
+
+# -----------------------------
+# Connection pool
+# -----------------------------
+class ConnectionPool:
+    """
+    Fixed-size pool of WAL-mode connections shared by the request handlers.
+    WAL lets readers in every uvicorn worker proceed while one writer commits.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self._pool = queue.Queue(maxsize=size)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+_pool = None
+
+
+def init_db(path: str = None, pool_size: int = None) -> ConnectionPool:
+    """
+    Opens the connection pool and creates tables/indexes if needed.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.close()
+    _pool = ConnectionPool(path or DB_PATH, pool_size or POOL_SIZE)
+    with _pool.connection() as conn:
+        conn.executescript(SCHEMA)
+        if conn.execute(COUNT_AGGREGATES).fetchone()[0] == 0:
+            # Backfill running totals for a database created before they existed. Workers
+            # start together, so re-check under the write lock: only the first one backfills.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute(COUNT_AGGREGATES).fetchone()[0] == 0:
+                    rows = conn.execute(SELECT_ALL_INVESTMENTS).fetchall()
+                    _apply_aggregate_delta(conn, [_to_investment(row) for row in rows], 1)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    return _pool
+
+
+def close_db():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+@contextmanager
+def connection():
+    if _pool is None:
+        init_db()
+    with _pool.connection() as conn:
+        yield conn
+
+
+@contextmanager
+def transaction():
+    """
+    Runs the block in one write transaction (BEGIN IMMEDIATE takes the write lock up front).
+    """
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+# -----------------------------
+# Investments
+# -----------------------------
+def _to_investment(row: sqlite3.Row) -> Investment:
+    return Investment(**dict(row))
+
+
+def _investment_params(investment: Investment) -> dict:
+    params = investment.model_dump()
+    params["created_at"] = investment.created_at.isoformat()
+    params["updated_at"] = investment.updated_at.isoformat() if investment.updated_at else None
+    return params
+
+
+def insert_investment(investment: Investment, conn: sqlite3.Connection = None) -> Investment:
+    """
+    Stores a new investment and returns it with its assigned id.
+    Pass `conn` to take part in a caller's transaction.
+    """
+    if conn is None:
+        with transaction() as conn:
+            return insert_investment(investment, conn)
+    cursor = conn.execute(INSERT_INVESTMENT, _investment_params(investment))
+    _apply_aggregate_delta(conn, [investment], 1)
+    return investment.model_copy(update={"id": cursor.lastrowid})
+
+
+def insert_investments(investments: list[Investment], players: list[Player] = ()) -> int:
+    """
+    Bulk-inserts positions (and upserts their card metadata) in a single transaction.
+    """
+    with transaction() as conn:
+        if players:
+            conn.executemany(UPSERT_PLAYER, [player.model_dump() for player in players])
+        conn.executemany(INSERT_INVESTMENT, [_investment_params(i) for i in investments])
+        _apply_aggregate_delta(conn, investments, 1)
+    return len(investments)
+
+
+def update_investment(investment: Investment, conn: sqlite3.Connection = None) -> Investment:
+    if conn is None:
+        with transaction() as conn:
+            return update_investment(investment, conn)
+    previous = conn.execute(SELECT_INVESTMENT_BY_ID, (investment.id,)).fetchone()
+    conn.execute(UPDATE_INVESTMENT, _investment_params(investment))
+    if previous is not None:
+        _apply_aggregate_delta(conn, [_to_investment(previous)], -1)
+        _apply_aggregate_delta(conn, [investment], 1)
+    return investment
+
+
+def delete_investment(investment_id: int, conn: sqlite3.Connection = None):
+    if conn is None:
+        with transaction() as conn:
+            return delete_investment(investment_id, conn)
+    previous = conn.execute(SELECT_INVESTMENT_BY_ID, (investment_id,)).fetchone()
+    conn.execute(DELETE_INVESTMENT, (investment_id,))
+    if previous is not None:
+        _apply_aggregate_delta(conn, [_to_investment(previous)], -1)
+
+
+def get_investment(investment_id: int) -> Optional[Investment]:
+    with connection() as conn:
+        row = conn.execute(SELECT_INVESTMENT_BY_ID, (investment_id,)).fetchone()
+    return _to_investment(row) if row else None
+
+
+def get_investment_by_name(name: str) -> Optional[Investment]:
+    with connection() as conn:
+        row = conn.execute(SELECT_INVESTMENT_BY_NAME, (name,)).fetchone()
+    return _to_investment(row) if row else None
+
+
+def get_investments_by_uuid(uuid: str) -> list[Investment]:
+    with connection() as conn:
+        rows = conn.execute(SELECT_INVESTMENTS_BY_UUID, (uuid,)).fetchall()
+    return [_to_investment(row) for row in rows]
+
+
+def list_investments() -> list[Investment]:
+    with connection() as conn:
+        rows = conn.execute(SELECT_ALL_INVESTMENTS).fetchall()
+    return [_to_investment(row) for row in rows]
+
+
+# -----------------------------
+# Portfolio aggregates
+# -----------------------------
+def overall_tier(overall: int) -> str:
+    # Card rarity tiers by overall
+    if overall >= 85: return "Diamond (85+)"
+    elif overall >= 80: return "Gold (80-84)"
+    elif overall >= 75: return "Silver (75-79)"
+    elif overall >= 65: return "Bronze (65-74)"
+    return "Common (<65)"
+
+
+def _apply_aggregate_delta(conn: sqlite3.Connection, investments: list[Investment], sign: int):
+    """
+    Adds (sign=1) or removes (sign=-1) the positions' contribution to the running
+    total, series and overall-tier aggregates. Deltas are summed per bucket first,
+    so a single position costs three keyed upserts and a batch only a few more.
+    """
+    deltas = {}
+    for investment in investments:
+        for key in (
+            ("total", "all"),
+            ("series", investment.series or "Unknown"),
+            ("tier", overall_tier(investment.overall)),
+        ):
+            delta = deltas.setdefault(key, {
+                "dimension": key[0], "bucket": key[1], "positions": 0, "total_quantity": 0,
+                "total_stubs_invested": 0, "total_qsv": 0, "total_risk": 0,
+            })
+            delta["positions"] += sign
+            delta["total_quantity"] += sign * investment.quantity
+            delta["total_stubs_invested"] += sign * investment.buy_price * investment.quantity
+            delta["total_qsv"] += sign * investment.qsv * investment.quantity
+            delta["total_risk"] += sign * investment.risk
+    conn.executemany(APPLY_AGGREGATE_DELTA, list(deltas.values()))
+
+
+def get_portfolio_summary() -> dict:
+    """
+    Returns the running totals plus per-series and per-tier breakdowns without
+    touching the investments table.
+    """
+    summary = {"total": None, "series": {}, "tier": {}}
+    with connection() as conn:
+        rows = conn.execute(SELECT_AGGREGATES).fetchall()
+    for row in rows:
+        values = dict(row)
+        dimension, bucket = values.pop("dimension"), values.pop("bucket")
+        if values["positions"] <= 0:
+            continue
+        if dimension == "total":
+            summary["total"] = values
+        else:
+            summary[dimension][bucket] = values
+    if summary["total"] is None:
+        summary["total"] = {"positions": 0, "total_quantity": 0, "total_stubs_invested": 0, "total_qsv": 0, "total_risk": 0}
+    return summary
+
+
+# -----------------------------
+# Players (card metadata)
+# -----------------------------
+def upsert_player(player: Player, conn: sqlite3.Connection = None):
+    if conn is None:
+        with transaction() as conn:
+            return upsert_player(player, conn)
+    conn.execute(UPSERT_PLAYER, player.model_dump())
+
+
+def get_player(uuid: str) -> Optional[Player]:
+    with connection() as conn:
+        row = conn.execute(SELECT_PLAYER, (uuid,)).fetchone()
+    return Player(**dict(row)) if row else None
@@ -1,14 +1,25 @@
-import requests
+import asyncio
+import csv
+import io
+import json
+import numpy as np
+from pydantic import ValidationError
+from app.services.mlb_api import get_listing, get_listing_async
+from app.services import market_snapshot
 from app.models.investment_models import InvestmentIn, Investment
 from datetime import datetime
 
 def create_investment_from_input(investment_in: InvestmentIn) -> Investment: 
     # Extract player data using MLBTS API
-    url = "https://mlb25.theshow.com/apis/listing.json"
-    response = requests.get(url, params={"uuid":investment_in.uuid})
-    data = response.json()
-    item = data["item"]
+    data = get_listing(investment_in.uuid)
+    return build_investment(investment_in, data["item"])
 
+async def create_investment_from_input_async(investment_in: InvestmentIn) -> Investment:
+    # Same as above, but awaits the item lookup instead of blocking a worker
+    data = await get_listing_async(investment_in.uuid)
+    return build_investment(investment_in, data["item"])
+
+def build_investment(investment_in: InvestmentIn, item: dict) -> Investment:
     # Assign variables to then create Investment instance
     name = item["name"]
     ovr = item["ovr"]
@@ -17,15 +28,17 @@ def create_investment_from_input(investment_in: InvestmentIn) -> Investment:
     total_invested = buy_price*quantity
     
     # Check if card is Live Series or not:
-    series = item.get("series", "")
+    series = item.get("series") or ""
     is_live = series.lower() == "live"
     qsv = get_qsv_from_overall(ovr, is_live)
 
     risk = total_invested - (qsv*quantity)
     created_at = datetime.utcnow()
     return Investment(
+        uuid = investment_in.uuid,
         name = name,
         overall = ovr,
+        series = series,
         buy_price = buy_price,
         quantity = quantity,
         total_invested = total_invested,
@@ -79,3 +92,214 @@ def get_qsv_from_overall(ovr: int, is_live: bool) -> int:
         elif ovr == 91: return 4500
         elif ovr >= 92: return 5000
 
+# QSV lookup tables indexed by overall, used to value many positions at once
+MAX_OVERALL = 125
+_QSV_LIVE = np.array([get_qsv_from_overall(ovr, True) for ovr in range(MAX_OVERALL + 1)])
+_QSV_NON_LIVE = np.array([get_qsv_from_overall(ovr, False) for ovr in range(MAX_OVERALL + 1)])
+
+def qsv_from_overall_array(ovr: np.ndarray, is_live: np.ndarray) -> np.ndarray:
+    # Vectorized get_qsv_from_overall
+    ovr = np.clip(np.asarray(ovr, dtype=np.int64), 0, MAX_OVERALL)
+    return np.where(is_live, _QSV_LIVE[ovr], _QSV_NON_LIVE[ovr])
+
+
+# -----------------------------
+# Bulk import
+# -----------------------------
+def parse_bulk_rows(body: bytes, fmt: str = None):
+    """
+    Parses CSV (header: uuid,buy_price,quantity) or JSON lines into InvestmentIn rows.
+    The format is sniffed from the first character when not given.
+
+    Returns:
+        rows (list[InvestmentIn]): Valid rows, in input order.
+        errors (list[dict]): One entry per rejected line.
+
+    Raises ValueError when the body isn't UTF-8 or a JSON array doesn't parse, since
+    there are no lines to report against.
+    """
+    text = body.decode("utf-8-sig").strip()
+    if fmt is None:
+        fmt = "jsonl" if text.startswith(("{", "[")) else "csv"
+
+    if fmt == "jsonl":
+        if text.startswith("["):
+            records = list(enumerate(json.loads(text), start=1))
+        else:
+            records = [(n, line) for n, line in enumerate(text.splitlines(), start=1) if line.strip()]
+    else:
+        records = list(enumerate(csv.DictReader(io.StringIO(text)), start=2))
+
+    rows, errors = [], []
+    for line, record in records:
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            rows.append(InvestmentIn(**record))
+        except ValidationError as e:
+            message = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            errors.append({"line": line, "error": message})
+        except (ValueError, TypeError) as e:
+            errors.append({"line": line, "error": str(e)})
+    return rows, errors
+
+async def iter_items(uuids, concurrency: int = 16):
+    """
+    Looks up card metadata for each uuid with bounded parallelism, yielding
+    (uuid, item, error) as each lookup finishes. Cards already in the market
+    snapshot are answered without an upstream call. Cards without an overall come
+    back as errors, since QSV and risk can't be computed for them.
+    """
+    snapshot = market_snapshot.get_snapshot()
+    limit = asyncio.Semaphore(concurrency)
+
+    async def lookup(uuid):
+        card = snapshot.by_uuid.get(uuid) if snapshot is not None else None
+        if card is not None and card.get("overall") is not None:
+            item = {"uuid": uuid, "name": card["name"], "ovr": card["overall"],
+                    "series": card.get("series"), "team": card.get("team"), "img": card.get("img")}
+            return uuid, item, None
+        try:
+            async with limit:
+                item = (await get_listing_async(uuid))["item"]
+        except Exception as e:
+            return uuid, None, str(e)
+        # QSV and risk need an overall; report the card as failed rather than guess
+        if item.get("ovr") is None:
+            return uuid, None, "card has no overall rating"
+        return uuid, item, None
+
+    for next_done in asyncio.as_completed([lookup(uuid) for uuid in uuids]):
+        yield await next_done
+
+def build_investments_bulk(rows: list[InvestmentIn], items: dict) -> list[Investment]:
+    """
+    Builds Investment records for rows whose uuid resolved in `items`, computing
+    total invested, QSV and risk for the whole batch in one vectorized pass.
+    """
+    rows = [row for row in rows if row.uuid in items]
+    if not rows:
+        return []
+    row_items = [items[row.uuid] for row in rows]
+    buy_price = np.array([row.buy_price for row in rows], dtype=np.int64)
+    quantity = np.array([row.quantity for row in rows], dtype=np.int64)
+    ovr = np.array([item["ovr"] for item in row_items], dtype=np.int64)
+    is_live = np.array([(item.get("series") or "").lower() == "live" for item in row_items])
+
+    total_invested = buy_price * quantity
+    qsv = qsv_from_overall_array(ovr, is_live)
+    risk = total_invested - qsv * quantity
+
+    created_at = datetime.utcnow()
+    return [
+        Investment(
+            uuid = row.uuid,
+            name = item["name"],
+            overall = item["ovr"],
+            series = item.get("series") or "",
+            buy_price = row.buy_price,
+            quantity = row.quantity,
+            total_invested = int(total_invested[i]),
+            qsv = int(qsv[i]),
+            risk = int(risk[i]),
+            created_at = created_at,
+            updated_at = None
+        )
+        for i, (row, item) in enumerate(zip(rows, row_items))
+    ]
+
+
+# -----------------------------
+# Mark-to-market valuation
+# -----------------------------
+MARKET_TAX = 0.10
+
+async def fetch_prices(uuids, concurrency: int = 16) -> dict:
+    """
+    Returns {uuid: (best_buy_price, best_sell_price)} with one lookup per unique uuid:
+    the market snapshot when it has the card, otherwise the cached listing.json call.
+    Cards whose lookup fails are left out.
+    """
+    snapshot = market_snapshot.get_snapshot()
+    limit = asyncio.Semaphore(concurrency)
+    prices = {}
+
+    async def lookup(uuid):
+        card = snapshot.by_uuid.get(uuid) if snapshot is not None else None
+        if card is not None:
+            prices[uuid] = (card.get("buy_price"), card.get("sell_price"))
+            return
+        try:
+            async with limit:
+                listing = await get_listing_async(uuid)
+            prices[uuid] = (listing.get("best_buy_price"), listing.get("best_sell_price"))
+        except Exception:
+            pass
+
+    await asyncio.gather(*(lookup(uuid) for uuid in dict.fromkeys(uuids)))
+    return prices
+
+VALUATION_FIELDS = (
+    "id", "uuid", "name", "overall", "buy_price", "quantity",
+    "best_buy_price", "best_sell_price", "market_value", "unrealized_pnl", "roi",
+)
+
+def value_portfolio(investments: list[Investment], prices: dict) -> tuple[list[dict], dict]:
+    """
+    Marks every position to market at best_sell_price less the 10% market tax.
+
+    Returns:
+        positions (list[dict]): Per-position valuation (pnl/roi are None when unpriced).
+        totals (dict): Portfolio-wide totals over the priced positions.
+    """
+    n = len(investments)
+    buy_price = np.array([i.buy_price for i in investments], dtype=np.float64)
+    quantity = np.array([i.quantity for i in investments], dtype=np.float64)
+    best_buy = np.full(n, np.nan)
+    best_sell = np.full(n, np.nan)
+    for idx, investment in enumerate(investments):
+        buy, sell = prices.get(investment.uuid, (None, None))
+        best_buy[idx] = np.nan if buy is None else buy
+        best_sell[idx] = np.nan if sell is None else sell
+
+    net_sell = best_sell * (1 - MARKET_TAX)
+    pnl_per_card = net_sell - buy_price
+    unrealized_pnl = pnl_per_card * quantity
+    roi = pnl_per_card / buy_price * 100
+    market_value = net_sell * quantity
+
+    priced = ~np.isnan(best_sell)
+    invested = buy_price * quantity
+
+    def clean(values, i, digits=2):
+        if np.isnan(values[i]):
+            return None
+        return int(values[i]) if digits == 0 else round(float(values[i]), digits)
+
+    positions = [
+        {
+            "id": investment.id,
+            "uuid": investment.uuid,
+            "name": investment.name,
+            "overall": investment.overall,
+            "buy_price": investment.buy_price,
+            "quantity": investment.quantity,
+            "best_buy_price": clean(best_buy, i, 0),
+            "best_sell_price": clean(best_sell, i, 0),
+            "market_value": clean(market_value, i),
+            "unrealized_pnl": clean(unrealized_pnl, i),
+            "roi": clean(roi, i),
+        }
+        for i, investment in enumerate(investments)
+    ]
+    total_invested = int(invested[priced].sum())
+    total_pnl = float(unrealized_pnl[priced].sum())
+    totals = {
+        "positions": n,
+        "priced_positions": int(priced.sum()),
+        "total_invested": total_invested,
+        "total_market_value": round(float(market_value[priced].sum()), 2),
+        "total_unrealized_pnl": round(total_pnl, 2),
+        "total_roi": round(total_pnl / total_invested * 100, 2) if total_invested else None,
+    }
+    return positions, totals
@@ -1,16 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import players, investments, frontend
+from app.routers import players, investments, frontend, metrics as metrics_router
+from app.services import http_client, market_snapshot, metrics, predictions, price_history
+from app.db import database
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
-app = FastAPI(title = "MLB The Show Market Tracker")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.init_db()
+    # Upgrade model is scored against each new market snapshot
+    predictions.load_model()
+    # Keep a full in-memory market snapshot refreshed in the background
+    poller = asyncio.create_task(market_snapshot.run_poller()) if market_snapshot.SNAPSHOT_ENABLED else None
+    # Price history bars and retention, kept off the per-snapshot append path
+    compactor = asyncio.create_task(price_history.run_compactor()) if market_snapshot.SNAPSHOT_ENABLED and price_history.HISTORY_ENABLED else None
+    yield
+    for task in (poller, compactor):
+        if task is not None:
+            task.cancel()
+    # Release pooled upstream connections on shutdown
+    await http_client.aclose()
+    http_client.close()
+    database.close_db()
+
+
+app = FastAPI(title = "MLB The Show Market Tracker", lifespan = lifespan)
+
+# Per-route latency and status counts, scraped from /metrics
+app.add_middleware(metrics.TimingMiddleware)
 
 # Register player routes
 app.include_router(players.router)
 app.include_router(investments.router)
 app.include_router(frontend.router)
+app.include_router(metrics_router.router)
 
 # Frontend stuff
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
-
@@ -3,8 +3,11 @@ from typing import Optional
 from datetime import datetime
 
 class Investment(BaseModel):
+    id: Optional[int] = None
+    uuid: Optional[str] = None
     name: str
     overall: int
+    series: Optional[str] = None
     buy_price: int
     quantity: int
     total_invested: int
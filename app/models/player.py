@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class Player(BaseModel):
+    uuid: str
+    name: str
+    overall: int
+    series: Optional[str] = None
+    team: Optional[str] = None
+    img: Optional[str] = None
+
+    @property
+    def is_live(self) -> bool:
+        return (self.series or "").lower() == "live"
+
+    @classmethod
+    def from_item(cls, item: dict) -> "Player":
+        # Build from an MLB The Show API item (listing.json / listings.json / item.json)
+        return cls(
+            uuid = item["uuid"],
+            name = item["name"],
+            overall = item["ovr"],
+            series = item.get("series"),
+            team = item.get("team"),
+            img = item.get("img")
+        )
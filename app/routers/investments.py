@@ -1,32 +1,46 @@
-from fastapi import APIRouter, Query, Body, Form
+from fastapi import APIRouter, HTTPException, Query, Body, Form
 from fastapi import Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Optional
-from app.investment_helpers import create_investment_from_input
+import asyncio
+import json
+import os
+from app.investment_helpers import create_investment_from_input_async, parse_bulk_rows, iter_items, build_investments_bulk, fetch_prices, value_portfolio, VALUATION_FIELDS
 from app.models.investment_models import InvestmentIn, Investment, InvestmentUpdate
+from app.models.player import Player
+from app.services.mlb_api import get_listing_async
+from app.db import database
 from fastapi.templating import Jinja2Templates
 
 
-# In-memory list of investments --> needs to be swapped to storing it into a DB at some point
-investments = []
-
 router = APIRouter(prefix="/investments", tags=["Investments"])
 
 templates = Jinja2Templates(directory="templates")
 
+BULK_FETCH_CONCURRENCY = int(os.getenv("MLB_BULK_FETCH_CONCURRENCY", "16"))
+
+
+def _save_investment(player: Player, investment: Investment):
+    # Blocking sqlite work (BEGIN IMMEDIATE may wait on busy_timeout); run off the event loop
+    with database.transaction() as conn:
+        database.upsert_player(player, conn)
+        database.insert_investment(investment, conn)
+
 
 # Add a single investment
 @router.post("/add")
-def add_investment(
+async def add_investment(
     uuid: str = Form(...),
     buy_price: int = Form(...),
     quantity: int = Form(...)
 ):
     investment_in = InvestmentIn(uuid=uuid, buy_price=buy_price, quantity=quantity)
-    new_investment = create_investment_from_input(investment_in)
-    investments.append(new_investment)
+    new_investment = await create_investment_from_input_async(investment_in)
+    # Listing is already cached from the lookup above
+    player = Player.from_item((await get_listing_async(uuid))["item"])
+    await asyncio.to_thread(_save_investment, player, new_investment)
     return HTMLResponse(content="""
   <div id="investment-modal"
         hx-on::after-request="document.body.dispatchEvent(new Event('investment-added'))"
@@ -37,10 +51,47 @@ def add_investment(
   </div>
 """)
 
+# Bulk import from CSV (uuid,buy_price,quantity) or JSON lines, streaming NDJSON progress
+@router.post("/bulk")
+async def bulk_add_investments(request: Request, format: Optional[str] = Query(default=None)):
+    body = await request.body()
+    # Parse up front: once streaming starts the status is already 200
+    try:
+        rows, errors = parse_bulk_rows(body, format)
+    except ValueError as e:
+        raise HTTPException(status_code = 400, detail = f"Could not parse body: {e}")
+
+    async def progress():
+        uuids = list(dict.fromkeys(row.uuid for row in rows))
+        yield json.dumps({"status": "parsed", "rows": len(rows), "unique_uuids": len(uuids), "errors": errors}) + "\n"
+
+        # Fetch each card once, with bounded parallelism
+        items, failed = {}, {}
+        async for uuid, item, error in iter_items(uuids, BULK_FETCH_CONCURRENCY):
+            if item is not None:
+                items[uuid] = item
+            else:
+                failed[uuid] = error
+            done = len(items) + len(failed)
+            if done % 50 == 0 or done == len(uuids):
+                yield json.dumps({"status": "fetching", "done": done, "total": len(uuids)}) + "\n"
+
+        new_investments = build_investments_bulk(rows, items)
+        players = [Player.from_item(item) for item in items.values()]
+        inserted = await asyncio.to_thread(database.insert_investments, new_investments, players)
+        yield json.dumps({
+            "status": "done",
+            "inserted": inserted,
+            "skipped": len(rows) - inserted,
+            "failed_uuids": failed
+        }) + "\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
 # Return all investments
 @router.get("/")
 def get_all_investments():
-    result = [dict(i) for i in investments]
+    result = [dict(i) for i in database.list_investments()]
     return {"investments" : result}
 
 # Calculate profit of existing investment
@@ -49,11 +100,7 @@ def calculate_profit(
     name : str = Query(),
     sell_price : int = Query()
 ):
-    investment = None
-    for i in investments:
-        if i.name == name:
-            investment = i
-            break
+    investment = database.get_investment_by_name(name)
     if investment == None:
         return {"error" : "No investment with that name found"}
     profit_per_card = investment.buy_price - (sell_price * 0.9)
@@ -69,17 +116,41 @@ def calculate_profit(
         "ROI%" : str(roi) + "%"
     }
 
+# Mark every position to market (after 10% tax) with one price lookup per unique card
+@router.get("/valuation")
+async def get_valuation(
+    sort : str = Query(default = "unrealized_pnl"),
+    descending : bool = Query(default = True),
+    page : int = Query(default = 1, ge = 1),
+    page_size : int = Query(default = 50, ge = 1, le = 500)
+):
+    if sort not in VALUATION_FIELDS:
+        raise HTTPException(status_code = 400, detail = f"sort must be one of {', '.join(VALUATION_FIELDS)}")
+    all_investments = await asyncio.to_thread(database.list_investments)
+    prices = await fetch_prices([i.uuid for i in all_investments if i.uuid], BULK_FETCH_CONCURRENCY)
+    positions, totals = value_portfolio(all_investments, prices)
+
+    # Unpriced positions (None) always sort last
+    priced = [p for p in positions if p.get(sort) is not None]
+    unpriced = [p for p in positions if p.get(sort) is None]
+    positions = sorted(priced, key = lambda p : p[sort], reverse = descending) + unpriced
+
+    start = (page - 1) * page_size
+    return {
+        "totals" : totals,
+        "page" : page,
+        "page_size" : page_size,
+        "total_pages" : (len(positions) + page_size - 1) // page_size,
+        "positions" : positions[start:start + page_size]
+    }
+
 # Delete existing investment
 @router.delete("/delete")
 def delete_investment(name : str = Query()):
-    investment = None
-    for i in investments:
-        if i.name == name:
-            investment = i
-            break
+    investment = database.get_investment_by_name(name)
     if investment == None:
         return {"error" : "No investment with that name found"}
-    investments.remove(investment)
+    database.delete_investment(investment.id)
     return {"message": f"Investment for {investment.name} deleted"}
 
 
@@ -89,11 +160,7 @@ def update_investment(
     name : str = Query(),
     update : InvestmentUpdate = Body()
 ):
-    investment = None
-    for i in investments:
-        if i.name == name:
-            investment = i
-            break
+    investment = database.get_investment_by_name(name)
     if investment == None:
         return {"error" : "No investment with that name found"}
     if update.buy_price is not None:
@@ -106,32 +173,20 @@ def update_investment(
     investment.total_invested = investment.buy_price * investment.quantity
     investment.risk = investment.total_invested - (investment.qsv * investment.quantity)
     investment.updated_at = datetime.utcnow()
+    database.update_investment(investment)
 
     return {
         "message": f"Investment for {investment.name} updated",
         "updated_investment": dict(investment)
     }
 
-# Summary of all investments
+# Summary of all investments (running aggregates, constant time)
 @router.get("/summary")
 def get_summary(request: Request):
-    total_quantity = 0
-    total_stubs_invested = 0
-    total_qsv = 0
-    total_risk = 0
-    for i in investments:
-        total_quantity += i.quantity
-        total_stubs_invested += (i.buy_price * i.quantity)
-        total_qsv += (i.qsv * i.quantity)
-        total_risk += i.risk
+    summary = database.get_portfolio_summary()
     return templates.TemplateResponse("partials/investment_summary.html", {
         "request": request,
-        "summary": {
-            "total_quantity": total_quantity,
-            "total_stubs_invested": total_stubs_invested,
-            "total_qsv": total_qsv,
-            "total_risk": total_risk
-        }
+        "summary": summary["total"],
+        "by_series": summary["series"],
+        "by_tier": summary["tier"]
     })
-
-
@@ -1,52 +1,109 @@
-from fastapi import APIRouter, Query, Request, Form
+import asyncio
+import time
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Query, Request, Form
 from fastapi.responses import HTMLResponse
-from app.services.mlb_api import fetch_market_data, format_player_listings, get_listing
+from app.services.mlb_api import fetch_market_data_async, format_player_listings, get_listing_async, get_cache_stats
+from app.services import flips, market_snapshot, metrics, predictions, price_history, search_index
+from app.services.market_table import MarketTable
 from fastapi.templating import Jinja2Templates
 
 templates = Jinja2Templates(directory="templates")
 
 router = APIRouter(prefix="/players", tags=["Players"])
 
-print("players.py loaded")
-
 # When someone sends a GET request to the route /players/, call the function below:
 @router.get("/")
-def list_players():
+async def list_players():
     return {"message": "This will list player data soon!"}
 
+@router.get("/cache-stats")
+async def cache_stats():
+    return get_cache_stats()
+
 @router.get("/live-prices")
-def get_live_prices(
+async def get_live_prices(
     sort : str = Query(default = None), 
     min_ovr : int = Query(default = None),
     max_ovr : int = Query(default = None),
-    limit : int = Query(default = None)
+    limit : int = Query(default = None, ge = 0),
+    series : str = Query(default = None),
+    team : str = Query(default = None),
+    descending : bool = Query(default = False)
 ):
-    raw_data = fetch_market_data()
-    players = format_player_listings(raw_data)
-    # Sort functionality
-    if sort != None:
-        players = sorted(players, key = lambda p : (p.get(sort) is None, p.get(sort)))       
-    # Min overall filter
-    if min_ovr != None:
-        players = [p for p in players if (p["overall"] != None) & (p["overall"] >= min_ovr)]
-    # Max overall filter
-    if max_ovr != None:
-        players = [p for p in players if (p["overall"] != None) & (p["overall"] <= max_ovr)]
-    # Limit functionality
-    if limit != None:
-        players = players[:limit]
+    # Serve from the in-memory market snapshot when the poller has one
+    snapshot = market_snapshot.get_snapshot()
+    if snapshot is not None:
+        table = snapshot.table
+    else:
+        raw_data = await fetch_market_data_async()
+        table = MarketTable(format_player_listings(raw_data))
+    # Vectorized ovr/series/team masks, then a top-k sort when a limit is given
+    try:
+        players = table.query(sort=sort, min_ovr=min_ovr, max_ovr=max_ovr, limit=limit, series=series, team=team, descending=descending)
+    except ValueError as e:
+        raise HTTPException(status_code = 400, detail = str(e))
     return {"count" : len(players), "players" : players} 
 
+@router.get("/upgrade-predictions")
+async def get_upgrade_predictions(
+    sort : str = Query(default = "upgrade_probability"),
+    min_ovr : int = Query(default = None),
+    max_ovr : int = Query(default = None),
+    limit : int = Query(default = 50, ge = 1),
+    series : str = Query(default = None),
+    team : str = Query(default = None),
+    descending : bool = Query(default = True)
+):
+    if not predictions.is_ready():
+        raise HTTPException(status_code = 503, detail = "Upgrade model is not loaded")
+    snapshot = await market_snapshot.get_or_refresh_snapshot()
+    # Scored once per snapshot; requests only sort/filter the cached table
+    prediction_set = await predictions.get_predictions(snapshot)
+    try:
+        players = prediction_set.query(sort=sort, min_ovr=min_ovr, max_ovr=max_ovr, limit=limit, series=series, team=team, descending=descending)
+    except ValueError as e:
+        raise HTTPException(status_code = 400, detail = str(e))
+    return {"count" : len(players), "computed_at" : prediction_set.computed_at, "players" : players}
+
+@router.get("/flips")
+async def get_flips(
+    sort : str = Query(default = "margin"),
+    min_ovr : int = Query(default = None),
+    max_ovr : int = Query(default = None),
+    limit : int = Query(default = 50, ge = 1),
+    series : str = Query(default = None),
+    team : str = Query(default = None),
+    descending : bool = Query(default = True)
+):
+    if sort not in flips.FLIP_METRICS:
+        raise HTTPException(status_code = 400, detail = f"sort must be one of {', '.join(flips.FLIP_METRICS)}")
+    snapshot = await market_snapshot.get_or_refresh_snapshot()
+    # Margins are computed once per snapshot; requests only mask and take the top-k
+    flip_table = flips.get_flips(snapshot)
+    players = flip_table.query(sort=sort, min_ovr=min_ovr, max_ovr=max_ovr, limit=limit, series=series, team=team, descending=descending)
+    return {"count" : len(players), "computed_at" : flip_table.computed_at, "players" : players}
+
 @router.get("/search", response_class=HTMLResponse)
-def search_player(name : str , request: Request):
+async def search_player(name : str , request: Request):
     if not name:
         return templates.TemplateResponse("search_results.html", {
         "request": request,
         "players": []
         })
     
-    raw_data = fetch_market_data(name = name)
-    formatted_data = format_player_listings(raw_data)
+    # Answer from the local index once a full-market snapshot has built it; until then go upstream
+    index = search_index.get_index()
+    formatted_data = index.search(name) if index is not None else []
+    metrics.CACHE_LOOKUPS.inc("search_index", "hit" if formatted_data else "miss")
+    if not formatted_data:
+        raw_data = await fetch_market_data_async(name = name)
+        formatted_data = format_player_listings(raw_data)
+
+    # Annotate with the latest upgrade probabilities without touching the shared card dicts
+    probabilities = predictions.current_probabilities()
+    if probabilities:
+        formatted_data = [{**p, "upgrade_probability" : probabilities.get(p.get("uuid"))} for p in formatted_data]
 
     return templates.TemplateResponse("search_results.html", {
         "request": request,
@@ -54,12 +111,34 @@ def search_player(name : str , request: Request):
     })
 
 @router.post("/select", response_class=HTMLResponse)
-def select_player(request:Request, uuid: str = Form(...)):
-    listing = get_listing(uuid)
+async def select_player(request:Request, uuid: str = Form(...)):
+    listing = await get_listing_async(uuid)
     player = listing["item"]
     return templates.TemplateResponse("investment_form.html", {
         "request":request,
         "player":player
     })
 
+def _epoch(value: datetime) -> float:
+    # Naive datetimes are taken as UTC, matching the history partitions
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+
+@router.get("/{uuid}/history")
+async def get_price_history(
+    uuid : str,
+    start : datetime = Query(default = None),
+    end : datetime = Query(default = None),
+    resolution : str = Query(default = None)
+):
+    if resolution is not None and resolution != "raw" and resolution not in price_history.RESOLUTIONS:
+        raise HTTPException(status_code = 400, detail = f"resolution must be one of raw, {', '.join(price_history.RESOLUTIONS)}")
+    end_ts = _epoch(end) if end else time.time()
+    start_ts = _epoch(start) if start else end_ts - 86400
+    if start_ts >= end_ts:
+        raise HTTPException(status_code = 400, detail = "start must be before end")
 
+    resolution = resolution or price_history.auto_resolution(end_ts - start_ts)
+    # Reads only the day partitions in range; parquet IO stays off the event loop
+    df = await asyncio.to_thread(price_history.query_history, uuid, start_ts, end_ts, resolution)
+    points = price_history.to_records(df)
+    return {"uuid" : uuid, "resolution" : resolution, "start" : start_ts, "end" : end_ts, "count" : len(points), "points" : points}
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+# -----------------------------
+# In-process TTL + LRU cache for upstream API responses
+# -----------------------------
+class ResponseCache:
+    """
+    Caches upstream JSON responses keyed by (endpoint, params).
+
+    - Each endpoint has its own TTL; entries older than the TTL but still inside
+      the stale window are served immediately while a background refresh runs.
+    - The cache holds at most `max_entries` responses, evicting the least recently used.
+    - Concurrent misses for the same key share a single upstream request.
+    """
+
+    def __init__(self, ttls: dict, default_ttl: float = 30, stale_ttl: float = 60, max_entries: int = 1024):
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "refreshes": 0}
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict = None):
+        return (endpoint, tuple(sorted((params or {}).items())))
+
+    def _ttl(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def _lookup(self, key):
+        """
+        Returns (value, state) where state is 'fresh', 'stale' or None (miss).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            ttl = self._ttl(key[0])
+            if age > ttl + self.stale_ttl:
+                del self._entries[key]
+                return None, None
+            self._entries.move_to_end(key)
+            return value, "fresh" if age <= ttl else "stale"
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get(self, key):
+        """
+        Returns a fresh cached value or None. Used by sync callers, which skip
+        stale-while-revalidate and single-flight.
+        """
+        value, state = self._lookup(key)
+        if state == "fresh":
+            self.stats["hits"] += 1
+            return value
+        self.stats["misses"] += 1
+        return None
+
+    async def get_or_fetch(self, endpoint: str, params: dict, fetch):
+        """
+        Returns the cached response for (endpoint, params), calling `fetch()`
+        (a zero-argument coroutine function) on a miss or to revalidate a stale entry.
+        """
+        key = self.make_key(endpoint, params)
+        value, state = self._lookup(key)
+        if state == "fresh":
+            self.stats["hits"] += 1
+            return value
+        if state == "stale":
+            self.stats["stale_hits"] += 1
+            if key not in self._inflight:
+                self.stats["refreshes"] += 1
+                self._start_fetch(key, fetch).add_done_callback(_ignore_result)
+            return value
+
+        self.stats["misses"] += 1
+        task = self._inflight.get(key) or self._start_fetch(key, fetch)
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, key, fetch) -> asyncio.Task:
+        async def run():
+            try:
+                value = await fetch()
+                self.set(key, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = self._inflight[key] = asyncio.ensure_future(run())
+        return task
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot_stats(self) -> dict:
+        return {**self.stats, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+def _ignore_result(task: asyncio.Task):
+    # Background refresh failures keep serving the stale entry until it expires
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+
+from app.investment_helpers import qsv_from_overall_array
+from app.services.market_table import top_k
+
+FLIP_METRICS = ("margin", "margin_pct", "qsv_floor", "risk", "buy_price", "sell_price", "overall")
+
+_cache = None
+
+
+# -----------------------------
+# Flip opportunities for one market snapshot
+# -----------------------------
+class FlipTable:
+    """
+    Vectorized flip economics for every card in a snapshot, reusing the snapshot's
+    MarketTable columns:
+
+    - margin: the table's spread_after_tax, best_sell_price after the 10% tax minus
+      best_buy_price (what a buy order at the top bid nets when it resells at the lowest ask)
+    - margin_pct: margin as a percentage of the buy price
+    - qsv_floor: quicksell value, the most a card can ever lose down to
+    - risk: buy_price - qsv_floor, the coins at stake per card
+
+    Built once per snapshot; requests only mask and take a top-k.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        table = self.table = snapshot.table
+        self.buy_price = table.buy_price
+        self.sell_price = table.sell_price
+        self.overall = table.overall
+
+        self.margin = table.spread_after_tax
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.margin_pct = np.where(table.buy_price > 0, self.margin / table.buy_price * 100, np.nan)
+
+        is_live = table.series_codes == table.series_lookup.get("live", -2)
+        known = ~np.isnan(table.overall)
+        qsv = qsv_from_overall_array(np.where(known, table.overall, 0), is_live).astype(np.float64)
+        self.qsv_floor = np.where(known, qsv, np.nan)
+        self.risk = table.buy_price - self.qsv_floor
+
+        # Cards without both prices can't be flipped
+        self.tradable = ~np.isnan(self.margin)
+        self.computed_at = time.time()
+
+    def __len__(self):
+        return int(self.tradable.sum())
+
+    def query(self, sort="margin", min_ovr=None, max_ovr=None, limit=None, series=None, team=None, descending=True) -> list[dict]:
+        idx = np.flatnonzero(self.table.mask(min_ovr, max_ovr, series, team) & self.tradable)
+        idx = top_k(idx, getattr(self, sort), limit, descending)
+        # Only the returned rows are materialized
+        return [self._row(i) for i in idx.tolist()]
+
+    def _row(self, i: int) -> dict:
+        qsv = self.qsv_floor[i]
+        return {
+            **self.table.row(i),
+            "margin" : round(float(self.margin[i]), 1),
+            "margin_pct" : None if np.isnan(self.margin_pct[i]) else round(float(self.margin_pct[i]), 2),
+            "qsv_floor" : None if np.isnan(qsv) else int(qsv),
+            "risk" : None if np.isnan(qsv) else int(self.risk[i]),
+        }
+
+
+def get_flips(snapshot) -> FlipTable:
+    """
+    The FlipTable for a snapshot, rebuilt only when the poller swaps in a new one.
+    """
+    global _cache
+    if _cache is None or _cache.snapshot is not snapshot:
+        _cache = FlipTable(snapshot)
+    return _cache
@@ -0,0 +1,125 @@
+import asyncio
+import os
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+from app.services import metrics
+from prediction_model import api_client
+from prediction_model.api_client import (
+    BACKOFF_FACTOR, CONNECT_TIMEOUT, MAX_RETRIES, POOL_SIZE, READ_TIMEOUT, RETRY_STATUSES, api_url, close,
+)
+
+# -----------------------------
+# Shared HTTP client for every MLB The Show API call from the web app
+# -----------------------------
+# The sync session (base URL, timeouts, retries, per-host cap) is owned by
+# prediction_model.api_client; this module adds upstream metrics and the async client.
+ASYNC_MAX_CONCURRENCY_PER_HOST = int(os.getenv("MLB_API_ASYNC_MAX_CONCURRENCY_PER_HOST", "100"))
+
+_async_client = None
+_async_host_limits = {}
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Metric label for an upstream URL: the endpoint file ('listings.json'), never the query.
+    """
+    return urlsplit(url).path.rsplit("/", 1)[-1] or "/"
+
+
+def get(endpoint: str, params=None, timeout=None) -> requests.Response:
+    """
+    GETs an API endpoint through the shared session, recording upstream metrics.
+
+    Args:
+        endpoint (str): Endpoint name ('listings.json') or absolute URL.
+        params (dict): Query parameters.
+        timeout (float | tuple): Overrides the default (connect, read) timeout.
+
+    Returns:
+        requests.Response: The final response after any retries on 429/5xx.
+    """
+    url = api_url(endpoint)
+    label = endpoint_label(url)
+    with metrics.upstream_span("GET", label):
+        try:
+            response = api_client.get(url, params=params, timeout=timeout)
+        except requests.RequestException:
+            metrics.UPSTREAM_RESPONSES.inc(label, "error")
+            raise
+    # urllib3 retries internally; its history holds one entry per attempt before the final one
+    retries = getattr(response.raw, "retries", None)
+    for attempt in (retries.history if retries is not None else ()):
+        metrics.UPSTREAM_RESPONSES.inc(label, attempt.status or "error")
+    metrics.UPSTREAM_RESPONSES.inc(label, response.status_code)
+    return response
+
+
+# -----------------------------
+# Async client (used by the FastAPI routes)
+# -----------------------------
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide async client, creating it on first use.
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONCURRENCY_PER_HOST,
+                max_keepalive_connections=POOL_SIZE,
+            ),
+        )
+    return _async_client
+
+
+def _async_host_limit(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    limit = _async_host_limits.get(host)
+    if limit is None:
+        limit = _async_host_limits[host] = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY_PER_HOST)
+    return limit
+
+
+def _retry_delay(attempt: int, response=None) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return BACKOFF_FACTOR * (2 ** attempt)
+
+
+async def aget(endpoint: str, params=None, timeout=None) -> httpx.Response:
+    """
+    Async counterpart of get(): same base URL, timeouts, retry/backoff on 429/5xx
+    and per-host concurrency cap, without blocking a threadpool worker.
+    """
+    url = api_url(endpoint)
+    label = endpoint_label(url)
+    client = get_async_client()
+    with metrics.upstream_span("GET", label):
+        for attempt in range(MAX_RETRIES + 1):
+            response = None
+            try:
+                async with _async_host_limit(url):
+                    response = await client.get(url, params=params, timeout=timeout or client.timeout)
+            except httpx.TransportError:
+                metrics.UPSTREAM_RESPONSES.inc(label, "error")
+                if attempt == MAX_RETRIES:
+                    raise
+            else:
+                metrics.UPSTREAM_RESPONSES.inc(label, response.status_code)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response
+            await asyncio.sleep(_retry_delay(attempt, response))
+
+
+async def aclose():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    # The semaphores are bound to this event loop; a later loop must build its own
+    _async_host_limits.clear()
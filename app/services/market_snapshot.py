@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import time
+
+from app.services import http_client, metrics, predictions, price_history, search_index
+from app.services.market_table import MarketTable
+from app.services.mlb_api import format_player_listings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ENABLED = os.getenv("MLB_SNAPSHOT_ENABLED", "1") == "1"
+POLL_INTERVAL = float(os.getenv("MLB_SNAPSHOT_INTERVAL", "60"))
+PAGE_CONCURRENCY = int(os.getenv("MLB_SNAPSHOT_PAGE_CONCURRENCY", "8"))
+
+_current = None
+# One market paging at a time: the poller and requests arriving before the first snapshot share it
+_refresh_lock = asyncio.Lock()
+
+
+# -----------------------------
+# Immutable, indexed view of every mlb_card listing
+# -----------------------------
+class MarketSnapshot:
+    """
+    A full copy of the market built from every page of listings.json.
+
+    Snapshots are never mutated after construction; the poller swaps in a new one,
+    so a reader paging through results always sees one consistent market.
+    Cards are indexed by uuid, and the columnar MarketTable serves the ovr, series,
+    team and price lookups. The raw item payloads are kept for the prediction service.
+    """
+
+    def __init__(self, players: list[dict], fetched_at: float = None, items: list[dict] = ()):
+        self.fetched_at = fetched_at or time.time()
+        self.by_uuid = {}
+        for p in players:
+            if p.get("uuid"):
+                self.by_uuid[p["uuid"]] = p
+        self.players = list(self.by_uuid.values())
+        self.table = MarketTable(self.players)
+        self.items = list({item["uuid"]: item for item in items if item.get("uuid")}.values())
+
+    def __len__(self):
+        return len(self.players)
+
+
+def get_snapshot() -> MarketSnapshot | None:
+    return _current
+
+
+metrics.register_callback(
+    "mlb_market_snapshot_cards", "gauge", "Cards in the current market snapshot",
+    (), lambda: {(): len(_current) if _current is not None else 0},
+)
+metrics.register_callback(
+    "mlb_market_snapshot_age_seconds", "gauge", "Seconds since the current market snapshot was fetched",
+    (), lambda: {(): time.time() - _current.fetched_at} if _current is not None else {},
+)
+
+
+# -----------------------------
+# Poller
+# -----------------------------
+async def _fetch_page(page: int) -> dict:
+    params = {"type": "mlb_card", "page": page}
+    response = await http_client.aget("listings.json", params=params)
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch listings page {page}: {response.status_code}")
+    return response.json()
+
+
+async def fetch_all_pages() -> list[dict]:
+    """
+    Pages through every mlb_card listing, fetching pages concurrently.
+    """
+    first = await _fetch_page(1)
+    total_pages = int(first.get("total_pages") or 1)
+    limit = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def bounded(page):
+        async with limit:
+            return await _fetch_page(page)
+
+    rest = await asyncio.gather(*(bounded(page) for page in range(2, total_pages + 1)))
+    return [first, *rest]
+
+
+async def refresh_snapshot() -> MarketSnapshot:
+    global _current
+    started = time.perf_counter()
+    pages = await fetch_all_pages()
+    players, items = [], []
+    for data in pages:
+        players.extend(format_player_listings(data))
+        items.extend(listing.get("item") or {} for listing in data.get("listings", []))
+    _current = MarketSnapshot(players, items=items)
+    search_index.rebuild(_current.players)
+    try:
+        await predictions.rebuild(_current)
+    except Exception:
+        logger.exception("Upgrade predictions refresh failed")
+    if price_history.HISTORY_ENABLED:
+        # Append-only record of every snapshot's prices (off the event loop)
+        try:
+            with metrics.BACKGROUND_DURATION.time("price_history_record"):
+                await asyncio.to_thread(price_history.record_snapshot, _current)
+        except Exception:
+            logger.exception("Price history append failed")
+    elapsed = time.perf_counter() - started
+    metrics.BACKGROUND_DURATION.observe(elapsed, "snapshot_refresh")
+    logger.info("Market snapshot refreshed: %d cards in %.2fs", len(_current), elapsed)
+    return _current
+
+
+async def get_or_refresh_snapshot() -> MarketSnapshot:
+    """
+    The current snapshot, or (before the first one) the result of a single refresh that
+    concurrent callers wait on instead of each paging the whole market.
+    """
+    if _current is not None:
+        return _current
+    async with _refresh_lock:
+        if _current is not None:
+            return _current
+        return await refresh_snapshot()
+
+
+async def run_poller(interval: float = POLL_INTERVAL):
+    """
+    Refreshes the market snapshot forever; started as a background task from app.main.
+    """
+    while True:
+        try:
+            async with _refresh_lock:
+                await refresh_snapshot()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Market snapshot refresh failed; keeping previous snapshot")
+        await asyncio.sleep(interval)
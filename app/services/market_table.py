@@ -0,0 +1,127 @@
+import numpy as np
+
+MARKET_TAX = 0.10
+
+NUMERIC_FIELDS = ("overall", "buy_price", "sell_price", "spread", "spread_after_tax", "upgrade_probability")
+STRING_FIELDS = ("name", "uuid")
+
+
+# -----------------------------
+# Columnar view of formatted listings for vectorized sort/filter/limit
+# -----------------------------
+class MarketTable:
+    """
+    Stores formatted listings (see mlb_api.format_player_listings) as NumPy columns.
+
+    Filters become boolean masks, sorting uses argsort, and a request with a limit
+    only orders the top-k rows via argpartition. Missing values always sort last.
+    The listings are shared with the snapshot and never written to; derived values
+    are added to the copies handed back by row().
+    """
+
+    def __init__(self, players: list[dict]):
+        self.rows = players
+        n = len(players)
+
+        self.overall = _float_column(players, "overall")
+        self.buy_price = _float_column(players, "buy_price")
+        self.sell_price = _float_column(players, "sell_price")
+        # Only present on rows annotated by the prediction service
+        self.upgrade_probability = _float_column(players, "upgrade_probability")
+
+        # Derived sort keys
+        self.spread = self.sell_price - self.buy_price
+        self.spread_after_tax = self.sell_price * (1 - MARKET_TAX) - self.buy_price
+
+        # Strings sort by precomputed rank so they go through the same numeric path
+        self.name_rank = _rank_column(players, "name")
+        self.uuid_rank = _rank_column(players, "uuid")
+
+        self.series_codes, self.series_lookup = _category_column(players, "series")
+        self.team_codes, self.team_lookup = _category_column(players, "team")
+        self.size = n
+
+    def __len__(self):
+        return self.size
+
+    def sort_key(self, field: str):
+        if field in NUMERIC_FIELDS:
+            return getattr(self, field)
+        if field in STRING_FIELDS:
+            return getattr(self, f"{field}_rank")
+        raise ValueError(f"sort must be one of {', '.join(NUMERIC_FIELDS + STRING_FIELDS)}")
+
+    def row(self, i: int) -> dict:
+        # A copy of the listing with its spreads, as returned to clients
+        spread, after_tax = self.spread[i], self.spread_after_tax[i]
+        return {
+            **self.rows[i],
+            "spread" : None if np.isnan(spread) else int(spread),
+            "spread_after_tax" : None if np.isnan(after_tax) else round(float(after_tax), 1),
+        }
+
+    def mask(self, min_ovr=None, max_ovr=None, series=None, team=None) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        # NaN comparisons are False, so cards without an overall drop out of ovr filters
+        if min_ovr is not None:
+            mask &= self.overall >= min_ovr
+        if max_ovr is not None:
+            mask &= self.overall <= max_ovr
+        if series is not None:
+            mask &= self.series_codes == self.series_lookup.get(series.lower(), -2)
+        if team is not None:
+            mask &= self.team_codes == self.team_lookup.get(team.lower(), -2)
+        return mask
+
+    def select(self, sort=None, min_ovr=None, max_ovr=None, limit=None, series=None, team=None, descending=False) -> np.ndarray:
+        """
+        Returns the row indices matching the filters, ordered by `sort` and cut to `limit`.
+        Raises ValueError for an unknown sort field.
+        """
+        idx = np.flatnonzero(self.mask(min_ovr, max_ovr, series, team))
+        key = self.sort_key(sort) if sort is not None else None
+        return top_k(idx, key, limit, descending)
+
+    def query(self, sort=None, min_ovr=None, max_ovr=None, limit=None, series=None, team=None, descending=False) -> list[dict]:
+        return [self.row(i) for i in self.select(sort, min_ovr, max_ovr, limit, series, team, descending).tolist()]
+
+
+def top_k(idx: np.ndarray, key: np.ndarray = None, limit: int = None, descending: bool = False) -> np.ndarray:
+    """
+    Orders the row indices idx by key[idx] (NaN last), cut to limit. With a limit only
+    the top-k rows are sorted, after an O(n) argpartition.
+    """
+    if key is not None and len(idx):
+        values = key[idx]
+        if descending:
+            # Negate so the largest come first while NaN still sorts last
+            values = -values
+        if limit is not None and limit < len(idx):
+            top = np.argpartition(values, limit - 1)[:limit] if limit > 0 else np.empty(0, dtype=int)
+            idx = idx[top[np.argsort(values[top], kind="stable")]]
+        else:
+            idx = idx[np.argsort(values, kind="stable")]
+
+    if limit is not None:
+        idx = idx[:max(limit, 0)]
+    return idx
+
+
+def _float_column(players: list[dict], field: str) -> np.ndarray:
+    return np.array([np.nan if p.get(field) is None else p[field] for p in players], dtype=np.float64)
+
+
+def _rank_column(players: list[dict], field: str) -> np.ndarray:
+    values = [p.get(field) for p in players]
+    order = sorted((i for i, v in enumerate(values) if v is not None), key=values.__getitem__)
+    ranks = np.full(len(values), np.nan)
+    ranks[order] = np.arange(len(order))
+    return ranks
+
+
+def _category_column(players: list[dict], field: str):
+    lookup = {}
+    codes = np.empty(len(players), dtype=np.int32)
+    for i, p in enumerate(players):
+        codes[i] = lookup.setdefault((p.get(field) or "").lower(), len(lookup))
+    return codes, lookup
@@ -0,0 +1,213 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers fast index hits through slow upstream retries
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics = []
+_callbacks = []
+
+
+# -----------------------------
+# In-process counters and histograms, rendered in the Prometheus text format
+# -----------------------------
+class Counter:
+    """
+    Monotonic counter keyed by label values. Safe to use from threadpool workers.
+    Values are per process: with several uvicorn workers each one reports its own.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, *labelvalues, amount: float = 1):
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by label values (Prometheus semantics).
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value: float, *labelvalues):
+        key = tuple(str(v) for v in labelvalues)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, *labelvalues):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(counts), total, n) for key, (counts, total, n) in self._values.items()}
+        for key, (counts, total, n) in sorted(values.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, n
+
+
+def register_callback(name: str, type: str, help: str, labelnames: tuple, func):
+    """
+    Exposes values owned elsewhere (e.g. ResponseCache.stats) without double counting.
+    func() returns {label values tuple: value} and is called on every scrape.
+    """
+    _callbacks.append((name, type, help, tuple(labelnames), func))
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def render() -> str:
+    """
+    Every metric in the Prometheus text exposition format (version 0.0.4).
+    """
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for name, type, help, labelnames, func in _callbacks:
+        try:
+            values = func()
+        except Exception:
+            logger.exception("Metrics callback %s failed", name)
+            continue
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {type}")
+        for key, value in sorted(values.items()):
+            labels = dict(zip(labelnames, key if isinstance(key, tuple) else (key,)))
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# Metrics shared across the app
+# -----------------------------
+REQUEST_DURATION = Histogram(
+    "mlb_http_request_duration_seconds", "Time to serve a request, by route template", ("method", "route"),
+)
+REQUESTS = Counter(
+    "mlb_http_requests_total", "Requests served, by route template and status code", ("method", "route", "status"),
+)
+UPSTREAM_DURATION = Histogram(
+    "mlb_upstream_request_duration_seconds", "MLB The Show API call time including retries, by endpoint", ("endpoint",),
+)
+UPSTREAM_RESPONSES = Counter(
+    "mlb_upstream_responses_total", "MLB The Show API responses (one per attempt), by endpoint and status code", ("endpoint", "status"),
+)
+CACHE_LOOKUPS = Counter(
+    "mlb_cache_lookups_total", "In-process cache lookups (search index, predictions), by cache and result", ("cache", "result"),
+)
+BACKGROUND_DURATION = Histogram(
+    "mlb_background_task_duration_seconds", "Snapshot refresh, prediction scoring and price history append/compaction time", ("task",),
+)
+
+
+@contextmanager
+def upstream_span(method: str, endpoint: str):
+    """
+    Times one upstream call (all retry attempts) under the endpoint's histogram and
+    logs it at DEBUG.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        UPSTREAM_DURATION.observe(elapsed, endpoint)
+        logger.debug("upstream %s %s took %.1fms", method, endpoint, elapsed * 1000)
+
+
+# -----------------------------
+# ASGI timing middleware
+# -----------------------------
+class TimingMiddleware:
+    """
+    Records a duration and a status for every HTTP request. Routes are labelled by
+    their template ('/players/search'), not the raw path, so label sets stay bounded.
+    Written as plain ASGI rather than BaseHTTPMiddleware to keep per-request overhead low.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            label = getattr(route, "path", None) or ("/static" if scope["path"].startswith("/static/") else "unmatched")
+            REQUEST_DURATION.observe(time.perf_counter() - started, scope["method"], label)
+            REQUESTS.inc(scope["method"], label, status)
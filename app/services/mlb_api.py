@@ -1,18 +1,65 @@
-import requests
+import os
+from app.services import http_client, metrics
+from app.services.cache import ResponseCache
 
-def fetch_market_data(name=None):
-    url = "https://mlb25.theshow.com/apis/listings.json"
+# Upstream responses are cached per endpoint; most traffic is identical requests seconds apart
+CACHE_TTLS = {
+    "listings.json" : float(os.getenv("MLB_CACHE_TTL_LISTINGS", "15")),
+    "listing.json" : float(os.getenv("MLB_CACHE_TTL_LISTING", "10")),
+}
+response_cache = ResponseCache(
+    ttls = CACHE_TTLS,
+    stale_ttl = float(os.getenv("MLB_CACHE_STALE_TTL", "60")),
+    max_entries = int(os.getenv("MLB_CACHE_MAX_ENTRIES", "2048")),
+)
+metrics.register_callback(
+    "mlb_response_cache_events_total", "counter", "Upstream response cache events (hits, stale_hits, misses, evictions, refreshes)",
+    ("event",), lambda: {(event,): count for event, count in response_cache.stats.items()},
+)
+metrics.register_callback(
+    "mlb_response_cache_entries", "gauge", "Upstream responses currently cached",
+    (), lambda: {(): len(response_cache._entries)},
+)
+
+def _market_params(name=None):
     params = {
         "type" : "mlb_card"
     }
     if name:
         params["name"] = name
-    response = requests.get(url, params=params)
+    return params
 
-    if response.status_code != 200:
-        raise Exception("Failed to fetch data from MLB The Show API")
-    
-    return response.json()
+def _listing_params(uuid):
+    return {
+        "type" : "mlb_card",
+        "uuid" : uuid
+    }
+
+def _get_json(endpoint, params):
+    key = response_cache.make_key(endpoint, params)
+    data = response_cache.get(key)
+    if data is None:
+        response = http_client.get(endpoint, params=params)
+        if response.status_code != 200:
+            raise Exception("Failed to fetch data from MLB The Show API")
+        data = response.json()
+        response_cache.set(key, data)
+    return data
+
+async def _get_json_async(endpoint, params):
+    async def fetch():
+        response = await http_client.aget(endpoint, params=params)
+        if response.status_code != 200:
+            raise Exception("Failed to fetch data from MLB The Show API")
+        return response.json()
+
+    return await response_cache.get_or_fetch(endpoint, params, fetch)
+
+def fetch_market_data(name=None):
+    return _get_json("listings.json", _market_params(name))
+
+async def fetch_market_data_async(name=None):
+    return await _get_json_async("listings.json", _market_params(name))
 
 def format_player_listings(raw_data):
     players = []
@@ -25,16 +72,18 @@ def format_player_listings(raw_data):
             "buy_price" : listing.get("best_buy_price"),
             "sell_price" : listing.get("best_sell_price"),
             "uuid" : item.get("uuid"),
-            "img" : item.get("img")
+            "img" : item.get("img"),
+            "series" : item.get("series"),
+            "team" : item.get("team")
         })
 
     return players
 
 def get_listing(uuid):
-    url = "https://mlb25.theshow.com/apis/listing.json"
-    params = {
-        "type" : "mlb_card",
-        "uuid" : uuid
-    }
-    response = requests.get(url, params)
-    return response.json()
\ No newline at end of file
+    return _get_json("listing.json", _listing_params(uuid))
+
+async def get_listing_async(uuid):
+    return await _get_json_async("listing.json", _listing_params(uuid))
+
+def get_cache_stats():
+    return response_cache.snapshot_stats()
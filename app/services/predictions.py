@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+import time
+
+import pandas as pd
+
+from app.services import metrics
+from app.services.market_table import MarketTable
+from prediction_model import registry
+from prediction_model.data_loader import extract_attributes
+from prediction_model.fangraphs import find_split_files, load_fg_splits
+from prediction_model.model import make_discrepancy_features
+from prediction_model.preprocess import add_fg_missing_indicators, drop_players_without_fg, merge_fangraphs_data
+
+logger = logging.getLogger(__name__)
+
+_ML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "ML")
+
+MODEL_NAME = os.getenv("MLB_MODEL_NAME", "XGBoost_v4_new_features")
+MODEL_VERSION = int(os.getenv("MLB_MODEL_VERSION")) if os.getenv("MLB_MODEL_VERSION") else None  # None = latest
+FG_SPLITS_DIR = os.getenv("MLB_FG_SPLITS_DIR", os.path.join(_ML_DIR, "data", "irl_data", "Hitters", "Advanced"))
+FG_WINDOW = os.getenv("MLB_FG_WINDOW")  # e.g. '5-24_6-10'; required when the directory holds several windows
+LIVE_SERIES = "Live"
+
+_model = None
+_fg_stats = None
+_cache = None
+_lock = asyncio.Lock()
+
+
+# -----------------------------
+# Model + FanGraphs window, loaded once at startup
+# -----------------------------
+def load_model(name: str = MODEL_NAME, version: int = MODEL_VERSION) -> bool:
+    """
+    Loads the upgrade classifier from the model registry and the FanGraphs splits it
+    scores against. Returns False (and leaves predictions disabled) when either is unavailable.
+    """
+    global _model, _fg_stats
+    try:
+        model = registry.load_model(name, version)
+        model.booster  # load eagerly at startup rather than on the first request
+        fg_stats = load_fg_splits(find_split_files(FG_SPLITS_DIR, windows=[FG_WINDOW] if FG_WINDOW else None))
+    except Exception:
+        logger.warning("Upgrade predictions disabled: could not load model %s", name, exc_info=True)
+        return False
+    _model, _fg_stats = model, fg_stats
+    logger.info("Loaded upgrade model %s v%d (%d features)", model.name, model.version, len(model.features))
+    return True
+
+
+def is_ready() -> bool:
+    return _model is not None
+
+
+# -----------------------------
+# Batch scoring
+# -----------------------------
+def build_features(items: list[dict], fg_stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds the training-time feature frame for every live-series hitter in one pass.
+    The current overall stands in for the roster update's old_overall.
+    """
+    hitters = [item for item in items if item.get("series") == LIVE_SERIES and item.get("is_hitter")]
+    df = extract_attributes(hitters)
+    df["old_overall"] = df["overall_rating"]
+    df = merge_fangraphs_data(df, fg_stats.copy())
+    df = drop_players_without_fg(df)
+    df = add_fg_missing_indicators(df)
+    return make_discrepancy_features(df)
+
+
+def score(items: list[dict]) -> dict:
+    """
+    Returns {uuid: upgrade probability} from a single predict_proba call over the pool.
+    """
+    df = build_features(items, _fg_stats)
+    if df.empty:
+        return {}
+    # The registry aligns columns to the training order; anything absent scores as missing
+    probabilities = _model.predict_proba(df)
+    return dict(zip(df["player_id"], probabilities.astype(float).round(4).tolist()))
+
+
+class PredictionSet:
+    """
+    Upgrade probabilities for one market snapshot, as annotated card rows plus a
+    MarketTable for sort/filter/top-k.
+    """
+
+    def __init__(self, snapshot, probabilities: dict):
+        self.snapshot = snapshot
+        self.probabilities = probabilities
+        self.rows = [
+            {**snapshot.by_uuid[uuid], "upgrade_probability": probability}
+            for uuid, probability in probabilities.items()
+            if uuid in snapshot.by_uuid
+        ]
+        self.table = MarketTable(self.rows)
+        self.computed_at = time.time()
+
+    def query(self, sort="upgrade_probability", min_ovr=None, max_ovr=None, limit=None, series=None, team=None, descending=True) -> list[dict]:
+        return self.table.query(sort=sort, min_ovr=min_ovr, max_ovr=max_ovr, limit=limit, series=series, team=team, descending=descending)
+
+
+async def rebuild(snapshot) -> PredictionSet | None:
+    """
+    Scores every card in the snapshot (off the event loop) and caches the result
+    until the next snapshot refresh.
+    """
+    global _cache
+    if not is_ready():
+        return None
+    async with _lock:
+        if _cache is not None and _cache.snapshot is snapshot:
+            return _cache
+        started = time.perf_counter()
+        probabilities = await asyncio.to_thread(score, snapshot.items)
+        _cache = PredictionSet(snapshot, probabilities)
+        elapsed = time.perf_counter() - started
+        metrics.BACKGROUND_DURATION.observe(elapsed, "predictions_rebuild")
+        logger.info("Scored %d cards for upgrade probability in %.2fs", len(probabilities), elapsed)
+        return _cache
+
+
+async def get_predictions(snapshot) -> PredictionSet | None:
+    if _cache is not None and _cache.snapshot is snapshot:
+        metrics.CACHE_LOOKUPS.inc("predictions", "hit")
+        return _cache
+    metrics.CACHE_LOOKUPS.inc("predictions", "miss")
+    return await rebuild(snapshot)
+
+
+def current_probabilities() -> dict:
+    """
+    The most recently computed probabilities (empty until the first scoring run).
+    """
+    return _cache.probabilities if _cache is not None else {}
@@ -0,0 +1,335 @@
+import asyncio
+import fcntl
+import glob
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = os.getenv("MLB_PRICE_HISTORY_DIR", "data/price_history")
+HISTORY_ENABLED = os.getenv("MLB_PRICE_HISTORY_ENABLED", "1") == "1"
+# Minimum seconds between recorded snapshots; with several workers polling, only one records each slot
+MIN_GAP = float(os.getenv("MLB_PRICE_HISTORY_MIN_GAP", "30"))
+# Today's per-snapshot files are merged into one once this many pile up
+MERGE_EVERY = int(os.getenv("MLB_PRICE_HISTORY_MERGE_EVERY", "30"))
+# Raw ticks are dropped this many days after they were compacted into bars
+RAW_RETENTION_DAYS = int(os.getenv("MLB_PRICE_HISTORY_RAW_DAYS", "7"))
+# Seconds between compaction passes (a background task, separate from appends)
+COMPACT_INTERVAL = float(os.getenv("MLB_PRICE_HISTORY_COMPACT_INTERVAL", "300"))
+ROW_GROUP_SIZE = 32_768
+
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+TICK_SCHEMA = pa.schema([
+    ("ts", pa.int64()),
+    ("uuid", pa.string()),
+    ("buy_price", pa.int32()),
+    ("sell_price", pa.int32()),
+])
+# Prices can be missing (no open orders); keep them as nullable ints rather than floats
+_NULLABLE_INTS = {pa.int32(): pd.Int32Dtype()}.get
+BAR_COLUMNS = [
+    "ts", "buy_open", "buy_high", "buy_low", "buy_close",
+    "sell_open", "sell_high", "sell_low", "sell_close", "samples",
+]
+
+
+# -----------------------------
+# On-disk layout
+#   ticks/date=YYYY-MM-DD/part-<ts>-<pid>.parquet   one file per recorded snapshot
+#   ticks/date=YYYY-MM-DD/merged-<ts>.parquet       today's parts merged, sorted by (uuid, ts)
+#   bars/res=<1m|1h|1d>/date=YYYY-MM-DD/bars.parquet OHLC bars for a finished day
+# Every partition is a UTC day, so a range query only opens the days it covers.
+# -----------------------------
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _days_between(start: float, end: float) -> list[str]:
+    first = datetime.fromtimestamp(start, tz=timezone.utc).date()
+    last = datetime.fromtimestamp(end, tz=timezone.utc).date()
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+def _ticks_dir(day: str, root: str) -> str:
+    return os.path.join(root, "ticks", f"date={day}")
+
+
+def _bars_path(resolution: str, day: str, root: str) -> str:
+    return os.path.join(root, "bars", f"res={resolution}", f"date={day}", "bars.parquet")
+
+
+def _tick_files(day: str, root: str) -> list[str]:
+    return sorted(glob.glob(os.path.join(_ticks_dir(day, root), "*.parquet")))
+
+
+def _tick_days(root: str) -> list[str]:
+    return sorted(os.path.basename(p)[len("date="):] for p in glob.glob(os.path.join(root, "ticks", "date=*")))
+
+
+@contextmanager
+def _locked(root: str, shared: bool = False):
+    # Appends and file removal take it exclusively; queries take it shared, so a
+    # query never lists a file that is unlinked before it is read
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".lock"), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _compaction_slot(root: str):
+    # Yields False when another process is already compacting
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".compact.lock"), "a+") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_table(table: pa.Table, path: str):
+    """
+    Writes next to the destination and renames into place, so readers never open a partial file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_last_ts(root: str) -> float:
+    try:
+        with open(os.path.join(root, ".last_ts")) as f:
+            return float(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0.0
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+def _price_array(values: np.ndarray) -> pa.Array:
+    missing = np.isnan(values)
+    return pa.array(np.where(missing, 0, values).astype(np.int32), mask=missing)
+
+
+def record_snapshot(snapshot, root: str = HISTORY_DIR) -> int:
+    """
+    Appends every card's current buy/sell price from a MarketSnapshot as one new file in
+    today's partition. Returns the rows written (0 when another worker already recorded
+    this slot). Compaction runs separately (run_compactor).
+    """
+    ts = int(snapshot.fetched_at)
+    table = snapshot.table
+    uuids = np.array([p["uuid"] for p in table.rows], dtype=object)
+    order = np.argsort(uuids, kind="stable")
+    ticks = pa.Table.from_arrays([
+        pa.array(np.full(len(uuids), ts, dtype=np.int64)),
+        pa.array(uuids[order].tolist(), type=pa.string()),
+        _price_array(table.buy_price[order]),
+        _price_array(table.sell_price[order]),
+    ], schema=TICK_SCHEMA)
+
+    with _locked(root):
+        if ts - _read_last_ts(root) < MIN_GAP:
+            return 0
+        _write_table(ticks, os.path.join(_ticks_dir(_day(ts), root), f"part-{ts}-{os.getpid()}.parquet"))
+        with open(os.path.join(root, ".last_ts"), "w") as f:
+            f.write(str(ts))
+    return len(ticks)
+
+
+# -----------------------------
+# Compaction
+# -----------------------------
+def _merge_ticks(day: str, root: str):
+    files = _tick_files(day, root)
+    if len(files) < 2:
+        return
+    merged = pq.read_table(files, schema=TICK_SCHEMA).sort_by([("uuid", "ascending"), ("ts", "ascending")])
+    last_ts = pc.max(merged["ts"]).as_py()
+    _write_table(merged, os.path.join(_ticks_dir(day, root), f"merged-{last_ts}.parquet"))
+    # A query between the write and the unlink sees some ticks twice; it drops duplicate ts
+    with _locked(root):
+        for path in files:
+            if os.path.basename(path) != f"merged-{last_ts}.parquet":
+                os.unlink(path)
+
+
+def make_bars(ticks: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    """
+    OHLC bars of buy and sell price per (uuid, bucket); ts is the bucket start.
+    """
+    seconds = RESOLUTIONS[resolution]
+    df = ticks.sort_values(["uuid", "ts"], kind="stable")
+    df = df.assign(bucket=df["ts"].to_numpy() // seconds * seconds)
+    bars = df.groupby(["uuid", "bucket"], sort=True).agg(
+        buy_open=("buy_price", "first"),
+        buy_high=("buy_price", "max"),
+        buy_low=("buy_price", "min"),
+        buy_close=("buy_price", "last"),
+        sell_open=("sell_price", "first"),
+        sell_high=("sell_price", "max"),
+        sell_low=("sell_price", "min"),
+        sell_close=("sell_price", "last"),
+        samples=("ts", "size"),
+    )
+    bars = bars.reset_index().rename(columns={"bucket": "ts"})
+    price_columns = [c for c in BAR_COLUMNS if c.startswith(("buy_", "sell_"))]
+    return bars.astype({**{c: "Int32" for c in price_columns}, "samples": "int32", "ts": "int64"})
+
+
+def compact_day(day: str, root: str = HISTORY_DIR):
+    """
+    Merges a finished day's ticks into one file and writes its 1m/1h/1d bars. The 1d
+    file is written last and marks the day as compacted.
+    """
+    _merge_ticks(day, root)
+    files = _tick_files(day, root)
+    if not files:
+        return
+    ticks = pq.read_table(files, schema=TICK_SCHEMA).to_pandas(types_mapper=_NULLABLE_INTS)
+    for resolution in RESOLUTIONS:
+        bars = make_bars(ticks, resolution)
+        _write_table(pa.Table.from_pandas(bars, preserve_index=False), _bars_path(resolution, day, root))
+    logger.info("Compacted price history for %s: %d ticks", day, len(ticks))
+
+
+def compact(now: float = None, root: str = HISTORY_DIR):
+    """
+    - Today: merges the per-snapshot files once MERGE_EVERY have accumulated.
+    - Finished days without bars: compacted into 1m/1h/1d bars.
+    - Raw ticks older than RAW_RETENTION_DAYS with bars in place: deleted.
+    Reading and grouping happen without the append lock; it is only taken to remove files.
+    Skipped when another process is already compacting.
+    """
+    with _compaction_slot(root) as acquired:
+        if not acquired:
+            return
+        now = now or time.time()
+        today = _day(now)
+        if len(glob.glob(os.path.join(_ticks_dir(today, root), "part-*.parquet"))) >= MERGE_EVERY:
+            _merge_ticks(today, root)
+
+        cutoff = _day(now - RAW_RETENTION_DAYS * 86400)
+        for day in _tick_days(root):
+            if day >= today:
+                continue
+            if not os.path.exists(_bars_path("1d", day, root)):
+                compact_day(day, root)
+            if day < cutoff:
+                with _locked(root):
+                    shutil.rmtree(_ticks_dir(day, root), ignore_errors=True)
+
+
+async def run_compactor(interval: float = COMPACT_INTERVAL, root: str = HISTORY_DIR):
+    """
+    Compacts the store forever; started as a background task from app.main.
+    """
+    while True:
+        try:
+            with metrics.BACKGROUND_DURATION.time("price_history_compact"):
+                await asyncio.to_thread(compact, None, root)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Price history compaction failed")
+        await asyncio.sleep(interval)
+
+
+# -----------------------------
+# Range queries
+# -----------------------------
+def auto_resolution(span: float) -> str:
+    """
+    Picks a resolution that keeps a range to a chartable number of points.
+    """
+    if span <= 12 * 3600:
+        return "raw"
+    if span <= 3 * 86400:
+        return "1m"
+    if span <= 60 * 86400:
+        return "1h"
+    return "1d"
+
+
+def _read_uuid(files: list[str], uuid: str, start: float, end: float, schema: pa.Schema = None) -> pd.DataFrame:
+    if not files:
+        return pd.DataFrame()
+    # Files are sorted by uuid, so the filter prunes whole row groups by their min/max stats
+    table = pq.read_table(files, schema=schema, filters=[("uuid", "=", uuid), ("ts", ">=", int(start)), ("ts", "<", int(np.ceil(end)))])
+    return table.drop_columns(["uuid"]).to_pandas(types_mapper=_NULLABLE_INTS)
+
+
+def query_history(uuid: str, start: float, end: float, resolution: str = "raw", root: str = HISTORY_DIR) -> pd.DataFrame:
+    """
+    Price history for one card over [start, end) (unix seconds).
+
+    'raw' returns the recorded ticks (kept RAW_RETENTION_DAYS); '1m'/'1h'/'1d' return
+    OHLC bars, from the compacted files for finished days and aggregated on the fly for
+    days that have not been compacted yet (today).
+    """
+    with _locked(root, shared=True):
+        return _query_history(uuid, start, end, resolution, root)
+
+
+def _query_history(uuid: str, start: float, end: float, resolution: str, root: str) -> pd.DataFrame:
+    days = _days_between(start, end)
+    if resolution == "raw":
+        df = _read_uuid([f for day in days for f in _tick_files(day, root)], uuid, start, end, TICK_SCHEMA)
+        return df.drop_duplicates("ts").sort_values("ts", ignore_index=True) if len(df) else pd.DataFrame(columns=["ts", "buy_price", "sell_price"])
+
+    seconds = RESOLUTIONS[resolution]
+    bucket_start = start // seconds * seconds
+    bar_files, raw_days = [], []
+    for day in days:
+        path = _bars_path(resolution, day, root)
+        if os.path.exists(path):
+            bar_files.append(path)
+        elif os.path.isdir(_ticks_dir(day, root)):
+            raw_days.append(day)
+
+    frames = []
+    if bar_files:
+        frames.append(_read_uuid(bar_files, uuid, bucket_start, end))
+    if raw_days:
+        ticks = _read_uuid([f for day in raw_days for f in _tick_files(day, root)], uuid, bucket_start, end, TICK_SCHEMA)
+        if len(ticks):
+            frames.append(make_bars(ticks.assign(uuid=uuid).drop_duplicates("ts"), resolution).drop(columns=["uuid"]))
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values("ts", ignore_index=True)[BAR_COLUMNS]
+
+
+def to_records(df: pd.DataFrame) -> list[dict]:
+    """
+    JSON-ready rows (missing prices as None).
+    """
+    return df.astype(object).where(df.notna(), None).to_dict("records")
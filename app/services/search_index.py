@@ -0,0 +1,120 @@
+import re
+from collections import defaultdict
+
+from prediction_model.preprocess import normalize_name
+
+_END = "$"
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+_current = None
+
+
+def search_key(name) -> str:
+    """
+    Accent-insensitive key used for both indexing and queries ('J.D. Martínez' -> 'jd martinez').
+    """
+    return " ".join(_NON_ALNUM.sub("", normalize_name(name)).split())
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# -----------------------------
+# In-memory player-name search index
+# -----------------------------
+class PlayerSearchIndex:
+    """
+    Prefix trie over every word start of each card name, plus a trigram index for
+    fuzzy fallback. Results are ranked: full-name prefix > word prefix > fuzzy,
+    then by overall (highest first).
+    """
+
+    def __init__(self, cards: list[dict] = ()):
+        self.cards = {}
+        self._keys = {}
+        self._trie = {}
+        self._grams = defaultdict(set)
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def add(self, card: dict):
+        uuid = card.get("uuid")
+        key = search_key(card.get("name"))
+        if not uuid or not key:
+            return
+        if uuid in self.cards:
+            # Already indexed under the same name; just refresh the card data
+            self.cards[uuid] = card
+            return
+        self.cards[uuid] = card
+        self._keys[uuid] = key
+
+        words = key.split(" ")
+        for i in range(len(words)):
+            node = self._trie
+            for ch in " ".join(words[i:]):
+                node = node.setdefault(ch, {})
+                node.setdefault(_END, set()).add(uuid)
+        for gram in _trigrams(key):
+            self._grams[gram].add(uuid)
+
+    def _prefix(self, query: str) -> set:
+        node = self._trie
+        for ch in query:
+            node = node.get(ch)
+            if node is None:
+                return set()
+        return node.get(_END, set())
+
+    def _fuzzy(self, query: str, exclude: set, min_similarity: float) -> dict:
+        query_grams = _trigrams(query)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for uuid in self._grams.get(gram, ()):
+                if uuid not in exclude:
+                    shared[uuid] += 1
+        scores = {}
+        for uuid, count in shared.items():
+            similarity = count / len(query_grams | _trigrams(self._keys[uuid]))
+            if similarity >= min_similarity:
+                scores[uuid] = similarity
+        return scores
+
+    def search(self, name: str, limit: int = 25, min_similarity: float = 0.3) -> list[dict]:
+        query = search_key(name)
+        if not query:
+            return []
+
+        ranked = []
+        prefix_hits = self._prefix(query)
+        for uuid in prefix_hits:
+            tier = 2 if self._keys[uuid].startswith(query) else 1
+            ranked.append((tier, 1.0, uuid))
+        if len(ranked) < limit:
+            for uuid, similarity in self._fuzzy(query, prefix_hits, min_similarity).items():
+                ranked.append((0, similarity, uuid))
+
+        ranked.sort(key=lambda r: (-r[0], -r[1], -(self.cards[r[2]].get("overall") or 0), self._keys[r[2]]))
+        return [self.cards[uuid] for _, _, uuid in ranked[:limit]]
+
+
+def get_index() -> PlayerSearchIndex | None:
+    """
+    The index built from the last full-market snapshot, or None before the first one.
+    A partial index would answer queries it can't see the whole market for.
+    """
+    return _current
+
+
+def rebuild(cards: list[dict]) -> PlayerSearchIndex:
+    """
+    Builds a fresh index from the complete card catalog and swaps it in.
+    """
+    global _current
+    _current = PlayerSearchIndex(cards)
+    return _current
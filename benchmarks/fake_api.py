@@ -0,0 +1,166 @@
+"""
+Local stand-in for the MLB The Show API, replaying the card JSON in ML/data/caches.
+
+Serves listings.json, listing.json, item.json and roster_update.json under /apis with
+configurable latency, so the app and the ML loaders can be exercised offline by pointing
+MLB_API_BASE_URL at it.
+
+Run standalone (from the repo root):
+    python -m benchmarks.fake_api --port 8001 --latency 0.05 --jitter 0.02
+    MLB_API_BASE_URL=http://127.0.0.1:8001/apis uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Query
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, "ML", "data", "caches")
+PRE_UPDATE = "pre-ru-6-13"
+POST_UPDATE = "post-ru-6-13"
+PER_PAGE = 25
+LIVE_SERIES_ID = "1337"
+
+
+def _read_cache(name: str) -> list[dict]:
+    items = []
+    for path in sorted(glob.glob(os.path.join(CACHE_DIR, name, "player_*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            items.append(json.load(f))
+    return items
+
+
+def _replica_uuid(uuid: str, copy: int) -> str:
+    return uuid if copy == 0 else hashlib.md5(f"{uuid}:{copy}".encode()).hexdigest()
+
+
+def _price(uuid: str, overall: int) -> tuple[int, int]:
+    # Stable per card, loosely tracking overall like the real market
+    seed = int(uuid[:8], 16)
+    sell = int(25 * 1.18 ** max(0, (overall or 60) - 60)) + seed % 50
+    buy = max(1, int(sell * (0.85 + (seed % 10) / 100)))
+    return buy, sell
+
+
+class FakeMarket:
+    """
+    Card catalog for the fake API. scale > 1 replicates every card with new uuids to
+    simulate a bigger market.
+    """
+
+    def __init__(self, scale: int = 1):
+        post = _read_cache(POST_UPDATE)
+        pre = {item["uuid"]: item for item in _read_cache(PRE_UPDATE)}
+        self.items = []
+        self.changes = []
+        for copy in range(max(1, scale)):
+            for item in post:
+                uuid = _replica_uuid(item["uuid"], copy)
+                self.items.append({**item, "uuid": uuid})
+                old = pre.get(item["uuid"])
+                if old is not None and old != item:
+                    self.changes.append({
+                        "name": item["name"],
+                        "old_rank": old["ovr"],
+                        "current_rank": item["ovr"],
+                        "item": {"uuid": uuid, "name": item["name"]},
+                    })
+        self.by_uuid = {item["uuid"]: item for item in self.items}
+
+    def listing(self, item: dict) -> dict:
+        buy, sell = _price(item["uuid"], item.get("ovr"))
+        return {"listing_name": item["name"], "best_buy_price": buy, "best_sell_price": sell, "item": item}
+
+
+def create_app(latency: float = 0.0, jitter: float = 0.0, scale: int = 1) -> FastAPI:
+    market = FakeMarket(scale)
+    app = FastAPI(title="Fake MLB The Show API")
+    app.state.market = market
+    app.state.requests = 0
+
+    async def delay():
+        app.state.requests += 1
+        wait = latency + (random.uniform(0, jitter) if jitter else 0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @app.get("/apis/listings.json")
+    async def listings(page: int = 1, name: str = None, series_id: str = None, type: str = Query(default="mlb_card")):
+        await delay()
+        items = market.items
+        if name:
+            needle = name.lower()
+            items = [i for i in items if needle in i["name"].lower()]
+        if series_id == LIVE_SERIES_ID:
+            items = [i for i in items if i.get("series") == "Live"]
+        total_pages = max(1, math.ceil(len(items) / PER_PAGE))
+        chunk = items[(page - 1) * PER_PAGE:page * PER_PAGE]
+        return {"page": page, "per_page": PER_PAGE, "total_pages": total_pages, "listings": [market.listing(i) for i in chunk]}
+
+    @app.get("/apis/listing.json")
+    async def listing(uuid: str, type: str = Query(default="mlb_card")):
+        await delay()
+        item = market.by_uuid.get(uuid)
+        if item is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return market.listing(item)
+
+    @app.get("/apis/item.json")
+    async def item(uuid: str):
+        await delay()
+        found = market.by_uuid.get(uuid)
+        if found is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return found
+
+    @app.get("/apis/roster_update.json")
+    async def roster_update(id: int):
+        await delay()
+        return {"id": id, "attribute_changes": market.changes}
+
+    return app
+
+
+class FakeApiServer:
+    """
+    Runs the fake API under uvicorn in a background thread (for use inside a benchmark).
+    """
+
+    def __init__(self, port: int = 8001, latency: float = 0.0, jitter: float = 0.0, scale: int = 1):
+        self.app = create_app(latency, jitter, scale)
+        self.server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.base_url = f"http://127.0.0.1:{port}/apis"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake MLB The Show API from the local card caches.")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, uniform in [0, jitter]")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate the card catalog this many times")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.jitter, args.scale), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+End-to-end load test: runs app.main:app under uvicorn (upstream replaced by
+benchmarks/fake_api.py) and drives it with simulated traders following the htmx flows:
+
+  - page load: GET / and the summary partial (hx-trigger="load")
+  - search-as-you-type: keystroke bursts, debounced like hx-trigger="keyup changed delay:300ms"
+  - POST /players/select on a result, then POST /investments/add
+  - GET /investments/summary again on the investment-added event
+
+Reports throughput, p50/p95/p99 latency and error rates per route for each worker count.
+
+Examples (from the repo root, after `pip install -e .`):
+    python -m benchmarks.load_test --workers 1 2 4 --users 50 --duration 30
+    python -m benchmarks.load_test --workers 2 --users 200 --think-scale 0 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+from benchmarks.fake_api import POST_UPDATE, _read_cache
+from benchmarks.run import ROOT, RESULTS_DIR, app_workdir, git_commit, summarize
+
+DEBOUNCE = 0.3  # hx-trigger delay on the search box
+_UUID_IN_RESULTS = re.compile(r'"uuid": "([0-9a-f]+)"')
+_SNAPSHOT_CARDS = re.compile(r"^mlb_market_snapshot_cards (\S+)$", re.M)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def wait_for_snapshot(base_url: str, timeout: float = 120):
+    """
+    Polls /metrics until the mlb_market_snapshot_cards gauge is non-zero. /live-prices
+    answers from upstream before the first snapshot, so it is no readiness signal.
+    Metrics are per worker: this only proves the worker that answered has its snapshot.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            match = _SNAPSHOT_CARDS.search(httpx.get(f"{base_url}/metrics", timeout=2).text)
+            if match and float(match.group(1)) > 0:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{base_url} had no market snapshot within {timeout:.0f}s")
+
+
+# -----------------------------
+# Simulated trader
+# -----------------------------
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            response, failed = None, True
+        self.samples[route].append(time.perf_counter() - started)
+        self.errors[route] += failed
+        return response
+
+
+async def trader(client: httpx.AsyncClient, recorder: Recorder, names: list[str], stop_at: float, think_scale: float, rng: random.Random):
+    async def think(low, high):
+        if think_scale:
+            await asyncio.sleep(rng.uniform(low, high) * think_scale)
+
+    await recorder.call(client, "GET /", "GET", "/")
+    await recorder.call(client, "GET /investments/summary", "GET", "/investments/summary")
+
+    while time.monotonic() < stop_at:
+        # Type part of a name; a request fires whenever typing pauses past the debounce
+        name = rng.choice(names)
+        typed = name[:rng.randint(3, min(len(name), 10))]
+        searches = []
+        for i in range(1, len(typed) + 1):
+            gap = rng.uniform(0.06, 0.45) if think_scale else DEBOUNCE + 0.01
+            if gap > DEBOUNCE or i == len(typed):
+                # htmx doesn't cancel earlier requests, so bursts overlap
+                searches.append(asyncio.create_task(recorder.call(client, "GET /players/search", "GET", "/players/search", params={"name": typed[:i]})))
+            if think_scale:
+                await asyncio.sleep(gap * think_scale)
+        responses = await asyncio.gather(*searches)
+        results = responses[-1]
+        uuids = _UUID_IN_RESULTS.findall(results.text) if results is not None else []
+        if not uuids:
+            continue
+
+        await think(0.5, 2.0)
+        uuid = rng.choice(uuids)
+        await recorder.call(client, "POST /players/select", "POST", "/players/select", data={"uuid": uuid})
+
+        await think(2.0, 6.0)
+        added = await recorder.call(client, "POST /investments/add", "POST", "/investments/add",
+                                    data={"uuid": uuid, "buy_price": rng.randint(100, 50000), "quantity": rng.randint(1, 10)})
+        if added is not None and added.status_code < 400:
+            # investment-added from:body reloads the summary partial
+            await recorder.call(client, "GET /investments/summary", "GET", "/investments/summary")
+
+        await think(3.0, 10.0)
+
+
+async def drive(base_url: str, users: int, duration: float, think_scale: float, names: list[str], seed: int) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.monotonic()
+        stop_at = started + duration
+        await asyncio.gather(*(
+            trader(client, recorder, names, stop_at, think_scale, random.Random(seed + i)) for i in range(users)
+        ))
+        elapsed = time.monotonic() - started
+    return recorder, elapsed
+
+
+def report(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        routes[route] = {**summarize(samples), "errors": recorder.errors[route], "error_rate": round(recorder.errors[route] / len(samples), 4)}
+    every = [s for samples in recorder.samples.values() for s in samples]
+    errors = sum(recorder.errors.values())
+    total = {**summarize(every), "errors": errors, "error_rate": round(errors / len(every), 4),
+             "throughput_rps": round(len(every) / elapsed, 1), "elapsed_s": round(elapsed, 1)} if every else {}
+    return {"total": total, "routes": routes}
+
+
+# -----------------------------
+# App under test
+# -----------------------------
+def start_app(workers: int, port: int, api_url: str, workdir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MLB_API_BASE_URL": api_url,
+        "MLB_MARKET_DB": os.path.join(workdir, f"load-{workers}.db"),
+        "MLB_ML_LOGGING": "0",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env,
+    )
+
+
+def stop(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test app.main:app with simulated htmx traders.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="uvicorn worker counts to test")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent simulated traders")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load per worker count")
+    parser.add_argument("--think-scale", type=float, default=1.0, help="Multiplier on typing/think times (0 = no pauses)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Fake API extra random latency in seconds")
+    parser.add_argument("--market-scale", type=int, default=1, help="Replicate the fake card catalog this many times")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Results file (default benchmarks/results/load-<timestamp>-<commit>.json)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"))
+    names = [item["name"] for item in _read_cache(POST_UPDATE)]
+    workdir = app_workdir()
+
+    api_port = free_port()
+    fake_api = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_api", "--port", str(api_port),
+         "--latency", str(args.latency), "--jitter", str(args.jitter), "--scale", str(args.market_scale)],
+        cwd=ROOT,
+    )
+    api_url = f"http://127.0.0.1:{api_port}/apis"
+    results = {}
+    try:
+        wait_until_up(f"{api_url}/listings.json?page=1")
+        for workers in args.workers:
+            port = free_port()
+            app = start_app(workers, port, api_url, workdir)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_for_snapshot(base_url)
+                print(f"workers={workers}: {args.users} traders for {args.duration:.0f}s...")
+                recorder, elapsed = asyncio.run(drive(base_url, args.users, args.duration, args.think_scale, names, args.seed))
+                results[f"workers={workers}"] = report(recorder, elapsed)
+            finally:
+                stop(app)
+    finally:
+        stop(fake_api)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{'':12} {'route':28} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for label, run in results.items():
+        total = run["total"]
+        if not total:
+            continue
+        for route, stats in run["routes"].items():
+            print(f"{label:12} {route:28} {stats['n']:7} {'':>8} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f} {stats['error_rate']:7.2%}")
+        print(f"{label:12} {'ALL':28} {total['n']:7} {total['throughput_rps']:8.1f} {total['p50_ms']:9.1f} {total['p95_ms']:9.1f} {total['p99_ms']:9.1f} {total['error_rate']:7.2%}")
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"commit": commit, "timestamp": datetime.now().isoformat(timespec="seconds"), "config": vars(args), "results": results}, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
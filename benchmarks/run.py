@@ -0,0 +1,290 @@
+"""
+Offline benchmark suite: times the FastAPI routes and the ML pipeline stages against the
+local fake API (benchmarks/fake_api.py) and writes the results as JSON, so runs on
+different commits can be diffed.
+
+Examples (from the repo root, after `pip install -e .`):
+    python -m benchmarks.run
+    python -m benchmarks.run --latency 0.05 --requests 500 --scales 1 4 16 64
+    python -m benchmarks.run --only ml --output benchmarks/results/ml.json
+    python -m benchmarks.run --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.fake_api import CACHE_DIR, PRE_UPDATE, FakeApiServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FG_DIR = os.path.join(ROOT, "ML", "data", "irl_data", "Hitters", "Advanced")
+FG_LHP = os.path.join(FG_DIR, "fg_5-24_6-10_LHP.csv")
+FG_RHP = os.path.join(FG_DIR, "fg_5-24_6-10_RHP.csv")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+ROSTER_UPDATE_ID = 11
+
+
+# -----------------------------
+# Timing helpers
+# -----------------------------
+def summarize(samples: list[float]) -> dict:
+    """
+    Latency summary in milliseconds.
+    """
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "p50_ms": round(pct(50), 3),
+        "p95_ms": round(pct(95), 3),
+        "p99_ms": round(pct(99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def time_calls(fn, repeat: int, warmup: int = 1, setup=None) -> dict:
+    for _ in range(warmup):
+        fn(setup() if setup else None)
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        started = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+@contextlib.contextmanager
+def quiet():
+    # Keep the ML stage logs (and the notebook-style prints in training) out of the benchmark output
+    from prediction_model.logs import set_logging
+    set_logging(False)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        set_logging(True)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+# -----------------------------
+# FastAPI routes
+# -----------------------------
+def app_workdir() -> str:
+    """
+    The app resolves templates/ and static/ relative to the working directory.
+    """
+    workdir = tempfile.mkdtemp(prefix="mlb-bench-")
+    shutil.copytree(os.path.join(ROOT, "templates"), os.path.join(workdir, "templates"))
+    os.makedirs(os.path.join(workdir, "static"), exist_ok=True)
+    return workdir
+
+
+def bench_routes(requests: int) -> dict:
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import market_snapshot
+
+    results = {}
+    with TestClient(app) as client:
+        # Wait for the poller's first full-market snapshot
+        deadline = time.monotonic() + 60
+        while market_snapshot.get_snapshot() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        snapshot = market_snapshot.get_snapshot()
+        cards = snapshot.players if snapshot else []
+        if not cards:
+            raise RuntimeError("Market snapshot never loaded from the fake API")
+        names = [c["name"] for c in cards]
+        uuids = [c["uuid"] for c in cards]
+
+        def route(name, call):
+            samples, errors = [], 0
+            for i in range(requests):
+                started = time.perf_counter()
+                response = call(i)
+                samples.append(time.perf_counter() - started)
+                errors += response.status_code >= 400
+            results[name] = {**summarize(samples), "errors": errors}
+
+        route("GET /players/live-prices", lambda i: client.get("/players/live-prices", params={"sort": "sell_price", "descending": True, "limit": 25}))
+        route("GET /players/search", lambda i: client.get("/players/search", params={"name": names[i % len(names)][:1 + i % 6]}))
+        route("POST /players/select", lambda i: client.post("/players/select", data={"uuid": uuids[i % len(uuids)]}))
+        route("POST /investments/add", lambda i: client.post("/investments/add", data={"uuid": uuids[i % len(uuids)], "buy_price": 100 + i, "quantity": 1 + i % 5}))
+        route("GET /investments/summary", lambda i: client.get("/investments/summary"))
+    return results
+
+
+# -----------------------------
+# ML pipeline stages
+# -----------------------------
+def _replicate(df, scale: int, id_col: str, name_col: str, id_offset=None):
+    import pandas as pd
+    copies = []
+    for k in range(scale):
+        copy = df.copy()
+        if k:
+            # Suffix the surname itself so replicas stay in their own fuzzy-match blocks
+            copy[name_col] = copy[name_col] + f"x{k}"
+            copy[id_col] = copy[id_col] + id_offset * k if id_offset else copy[id_col] + f"-{k}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def bench_ml(scales: list[int], repeat: int) -> dict:
+    import pandas as pd
+    from prediction_model import data_loader
+    from prediction_model.data_loader import add_to_attribute_store, load_player_attributes, load_roster_update_data, _store_record
+    from prediction_model.model import make_discrepancy_features, train_model
+    from prediction_model.preprocess import (
+        add_fg_missing_indicators, drop_duplicate_players, drop_players_without_fg, merge_and_split_roster_update,
+        merge_attribute_roster, merge_fangraphs_data, merge_lhp_rhp, split_attribute_data,
+    )
+
+    workdir = tempfile.mkdtemp(prefix="mlb-bench-ml-")
+    with quiet():
+        update_df = load_roster_update_data(ROSTER_UPDATE_ID)
+        cache_dir = os.path.join(workdir, "pre")
+        shutil.copytree(os.path.join(CACHE_DIR, PRE_UPDATE), cache_dir)
+        attributes = load_player_attributes(update_df["player_id"].tolist(), cache_dir)
+        hitters, _ = split_attribute_data(attributes)
+        hitter_changes, _ = merge_and_split_roster_update(update_df, attributes)
+        hitter_df = merge_attribute_roster(hitters, hitter_changes)
+        fg_df = merge_lhp_rhp(FG_LHP, FG_RHP)
+    raw = {uuid: data_loader.get_cached_player_data(uuid, cache_dir) for uuid in update_df["player_id"]}
+
+    results = {}
+    for scale in scales:
+        stage = {}
+
+        # Columnar store read for scale x the roster update's players
+        scaled_dir = os.path.join(workdir, f"scale{scale}")
+        records = [_store_record(f"{uuid}-{k}" if k else uuid, data) for k in range(scale) for uuid, data in raw.items()]
+        add_to_attribute_store(scaled_dir, records)
+        uuids = [r["uuid"] for r in records]
+        stage["load_player_attributes"] = time_calls(
+            lambda _: load_player_attributes(uuids, scaled_dir), repeat, setup=data_loader._store_memo.clear
+        )
+
+        hitters_scaled = _replicate(hitter_df, scale, "player_id", "player_name")
+        fg_scaled = _replicate(fg_df, scale, "playerId", "Name", id_offset=10_000_000)
+        with quiet():
+            stage["merge_fangraphs_data"] = time_calls(lambda _: merge_fangraphs_data(hitters_scaled.copy(), fg_scaled), repeat)
+            merged = merge_fangraphs_data(hitters_scaled.copy(), fg_scaled)
+            df = add_fg_missing_indicators(drop_players_without_fg(drop_duplicate_players(merged)))
+        stage["make_discrepancy_features"] = time_calls(lambda _: make_discrepancy_features(df.copy()), repeat)
+
+        features = make_discrepancy_features(df.copy())
+        registry_dir = os.path.join(workdir, "registry")
+        with quiet():
+            stage["train_model"] = time_calls(
+                lambda _: train_model(features, model_name=f"bench_{scale}", log_path=os.path.join(workdir, "log.jsonl"), registry_dir=registry_dir),
+                max(1, repeat // 2), warmup=0,
+            )
+        results[f"x{scale}"] = {"rows": len(features), "players": len(uuids), "stages": stage}
+        print(f"  scale x{scale}: {len(features)} rows")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# -----------------------------
+# Comparing runs
+# -----------------------------
+def _flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict) and "p50_ms" in value:
+            flat[f"{prefix}{key}"] = value
+        elif isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key} / "))
+    return flat
+
+
+def compare(old_path: str, new_path: str, metric: str = "p50_ms"):
+    with open(old_path) as f:
+        old = _flatten(json.load(f)["results"])
+    with open(new_path) as f:
+        new = _flatten(json.load(f)["results"])
+    print(f"{'benchmark':70} {'old':>10} {'new':>10} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key][metric], new[key][metric]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{key:70} {before:10.2f} {after:10.2f} {change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--only", choices=["routes", "ml"], help="Run one group only")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fake API extra random latency in seconds")
+    parser.add_argument("--market-scale", type=int, default=1, help="Replicate the fake card catalog this many times")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16], help="Data size multipliers for the ML stages")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per ML stage")
+    parser.add_argument("--port", type=int, default=8765, help="Fake API port")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Diff two results files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{git_commit()}.json"))
+    workdir = app_workdir()
+    os.environ["MLB_API_BASE_URL"] = f"http://127.0.0.1:{args.port}/apis"
+    os.environ["MLB_MARKET_DB"] = os.path.join(workdir, "bench.db")
+    os.chdir(workdir)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": {},
+    }
+    with FakeApiServer(args.port, args.latency, args.jitter, args.market_scale):
+        if args.only in (None, "routes"):
+            print("Timing routes...")
+            report["results"]["routes"] = bench_routes(args.requests)
+        if args.only in (None, "ml"):
+            print("Timing ML stages...")
+            report["results"]["ml"] = bench_ml(args.scales, args.repeat)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, stats in _flatten(report["results"]).items():
+        print(f"{name:70} p50 {stats['p50_ms']:9.2f} ms | p95 {stats['p95_ms']:9.2f} ms")
+    print(f"Results written to {output}")
+    os.chdir(ROOT)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import investment_helpers
+from app.db import database
+from app.routers import investments
+from app.services import market_snapshot
+
+ITEMS = {
+    "judge": {"uuid": "judge", "name": "Aaron Judge", "ovr": 99, "series": "Live", "team": "Yankees"},
+    "legend": {"uuid": "legend", "name": "Babe Ruth", "ovr": None, "series": "Legend", "team": "Yankees"},
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    async def get_listing_async(uuid):
+        if uuid not in ITEMS:
+            raise RuntimeError(f"no listing for {uuid}")
+        return {"item": ITEMS[uuid]}
+
+    monkeypatch.setattr(investment_helpers, "get_listing_async", get_listing_async)
+    monkeypatch.setattr(market_snapshot, "_current", None)
+    database.init_db(str(tmp_path / "market.db"), pool_size=1)
+    app = FastAPI()
+    app.include_router(investments.router)
+    yield TestClient(app)
+    database.close_db()
+
+
+def _bulk(client, body, **params):
+    response = client.post("/investments/bulk", content=body, params=params)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_invalid_rows_are_reported_by_line(client):
+    body = "uuid,buy_price,quantity\njudge,1000,2\njudge,0,1\njudge,100,\njudge,abc,1\n"
+    events = _bulk(client, body)
+    parsed, done = events[0], events[-1]
+    assert parsed["rows"] == 1
+    assert [error["line"] for error in parsed["errors"]] == [3, 4, 5]
+    assert done == {"status": "done", "inserted": 1, "skipped": 0, "failed_uuids": {}}
+
+
+def test_failed_lookups_and_cards_without_overall_are_skipped(client):
+    body = "\n".join(json.dumps(row) for row in [
+        {"uuid": "judge", "buy_price": 1000, "quantity": 2},
+        {"uuid": "legend", "buy_price": 500, "quantity": 1},
+        {"uuid": "missing", "buy_price": 10, "quantity": 1},
+    ])
+    done = _bulk(client, body)[-1]
+    assert done["inserted"] == 1
+    assert done["skipped"] == 2
+    assert done["failed_uuids"] == {"legend": "card has no overall rating", "missing": "no listing for missing"}
+    assert [i.uuid for i in database.list_investments()] == ["judge"]
+
+
+def test_snapshot_card_without_overall_goes_upstream(client, monkeypatch):
+    snapshot = market_snapshot.MarketSnapshot([
+        {"uuid": "judge", "name": "Aaron Judge", "overall": 99, "series": "Live"},
+        {"uuid": "legend", "name": "Babe Ruth", "overall": None, "series": "Legend"},
+    ])
+    monkeypatch.setattr(market_snapshot, "_current", snapshot)
+    done = _bulk(client, '[{"uuid": "judge", "buy_price": 1000, "quantity": 1}, {"uuid": "legend", "buy_price": 5, "quantity": 1}]')[-1]
+    assert done["inserted"] == 1
+    assert done["failed_uuids"] == {"legend": "card has no overall rating"}
+
+
+def test_unparseable_body_is_a_400(client):
+    response = client.post("/investments/bulk", content=b"[not json")
+    assert response.status_code == 400
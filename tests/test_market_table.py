@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from app.services.market_table import MarketTable, top_k
+
+
+def _card(uuid, name, overall, buy, sell, series="Live", team="Yankees"):
+    return {"uuid": uuid, "name": name, "overall": overall, "buy_price": buy, "sell_price": sell, "series": series, "team": team}
+
+
+@pytest.fixture
+def table():
+    return MarketTable([
+        _card("a", "Aaron Judge", 99, 900, 1000),
+        _card("b", "Juan Soto", 95, 500, 700, team="Mets"),
+        _card("c", "Gerrit Cole", 90, 300, 320),
+        _card("d", "Anthony Volpe", 80, 100, 200, series="Rookie"),
+        _card("e", "No Overall", None, 50, 60),
+        _card("f", "No Prices", 85, None, None),
+    ])
+
+
+def test_top_k_matches_full_sort(table):
+    full = [p["uuid"] for p in table.query(sort="overall", descending=True)]
+    for limit in range(len(table) + 2):
+        assert [p["uuid"] for p in table.query(sort="overall", descending=True, limit=limit)] == full[:limit]
+
+
+def test_missing_values_sort_last(table):
+    ascending = [p["uuid"] for p in table.query(sort="overall")]
+    descending = [p["uuid"] for p in table.query(sort="overall", descending=True)]
+    assert ascending[-1] == descending[-1] == "e"
+    by_spread = [p["uuid"] for p in table.query(sort="spread", descending=True)]
+    assert by_spread[0] == "b" and by_spread[-1] == "f"
+
+
+def test_filters(table):
+    assert {p["uuid"] for p in table.query(min_ovr=90)} == {"a", "b", "c"}
+    assert {p["uuid"] for p in table.query(min_ovr=85, max_ovr=95)} == {"b", "c", "f"}
+    assert {p["uuid"] for p in table.query(series="rookie")} == {"d"}
+    assert {p["uuid"] for p in table.query(team="METS")} == {"b"}
+    assert table.query(team="Nobody") == []
+
+
+def test_rows_are_copies_with_spreads(table):
+    row = table.query(sort="name", limit=1)[0]
+    assert row["uuid"] == "a"
+    assert row["spread"] == 100
+    assert row["spread_after_tax"] == 0.0
+    assert "spread" not in table.rows[0]
+
+
+def test_unknown_sort_raises(table):
+    with pytest.raises(ValueError):
+        table.query(sort="typo")
+
+
+def test_top_k_limit_zero():
+    assert top_k(np.arange(3), np.array([3.0, 1.0, 2.0]), 0).tolist() == []
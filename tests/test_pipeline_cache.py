@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+
+from prediction_model.pipeline import Pipeline
+
+calls = []
+
+
+def add_column(df, value):
+    calls.append(value)
+    df["added"] = value
+    return df
+
+
+def read_config(path):
+    calls.append(path)
+    with open(path) as f:
+        return f.read()
+
+
+def fill_cache(uuids, cache_dir):
+    # Like load_player_attributes: reads the cache dir and writes what it's missing
+    calls.append(tuple(uuids))
+    os.makedirs(cache_dir, exist_ok=True)
+    for uuid in uuids:
+        path = os.path.join(cache_dir, f"{uuid}.txt")
+        if not os.path.exists(path):
+            with open(path, "w") as f:
+                f.write(uuid)
+    return sorted(os.listdir(cache_dir))
+
+
+def _pipeline(tmp_path):
+    calls.clear()
+    return Pipeline(str(tmp_path / "pipeline_cache"), verbose=False)
+
+
+def test_same_inputs_hit_and_changed_inputs_miss(tmp_path):
+    p = _pipeline(tmp_path)
+    df = pd.DataFrame({"a": [1, 2, 3]})
+
+    first = p.run("add", add_column, df, 1)
+    second = p.run("add", add_column, df.copy(), 1)
+    assert calls == [1]
+    pd.testing.assert_frame_equal(first, second)
+    # The stage mutates its input; the caller's frame is left alone
+    assert "added" not in df
+
+    p.run("add", add_column, df, 2)
+    p.run("add", add_column, pd.DataFrame({"a": [1, 2, 4]}), 1)
+    assert calls == [1, 2, 1]
+    assert p.stats == {"hits": 1, "misses": 3}
+
+
+def test_refresh_and_disabled_always_run(tmp_path):
+    p = _pipeline(tmp_path)
+    df = pd.DataFrame({"a": [1]})
+    p.run("add", add_column, df, 1)
+    p.run("add", add_column, df, 1, refresh=True)
+    Pipeline(str(tmp_path / "pipeline_cache"), enabled=False).run("add", add_column, df, 1)
+    assert calls == [1, 1, 1]
+
+
+def test_file_dependency_is_part_of_the_key(tmp_path):
+    p = _pipeline(tmp_path)
+    config = tmp_path / "config.txt"
+    config.write_text("one")
+
+    assert p.run("config", read_config, str(config), deps=[str(config)]) == "one"
+    assert p.run("config", read_config, str(config), deps=[str(config)]) == "one"
+    config.write_text("two")
+    assert p.run("config", read_config, str(config), deps=[str(config)]) == "two"
+    assert len(calls) == 2
+
+
+def test_state_written_by_the_stage_still_hits(tmp_path):
+    p = _pipeline(tmp_path)
+    cache_dir = str(tmp_path / "attributes")
+
+    first = p.run("fill", fill_cache, ["a", "b"], cache_dir, state=[cache_dir])
+    second = p.run("fill", fill_cache, ["a", "b"], cache_dir, state=[cache_dir])
+    assert first == second == ["a.txt", "b.txt"]
+    assert len(calls) == 1
+
+    # Someone else changing the cache dir invalidates the stage
+    with open(os.path.join(cache_dir, "c.txt"), "w") as f:
+        f.write("c")
+    assert p.run("fill", fill_cache, ["a", "b"], cache_dir, state=[cache_dir]) == ["a.txt", "b.txt", "c.txt"]
+    assert p.run("fill", fill_cache, ["a", "b"], cache_dir, state=[cache_dir]) == ["a.txt", "b.txt", "c.txt"]
+    assert len(calls) == 2
@@ -0,0 +1,68 @@
+import pytest
+
+from app.db import database
+from app.models.investment_models import Investment
+
+FIELDS = ("positions", "total_quantity", "total_stubs_invested", "total_qsv", "total_risk")
+
+
+@pytest.fixture
+def db(tmp_path):
+    database.init_db(str(tmp_path / "market.db"), pool_size=1)
+    yield
+    database.close_db()
+
+
+def _investment(name, overall, series, buy_price, quantity, qsv):
+    return Investment(
+        uuid=name, name=name, overall=overall, series=series, buy_price=buy_price, quantity=quantity,
+        total_invested=buy_price * quantity, qsv=qsv, risk=(buy_price - qsv) * quantity,
+    )
+
+
+def _recompute() -> dict:
+    # The summary built from scratch over every stored investment
+    summary = {"total": dict.fromkeys(FIELDS, 0), "series": {}, "tier": {}}
+    for i in database.list_investments():
+        for dimension, bucket in (("series", i.series or "Unknown"), ("tier", database.overall_tier(i.overall))):
+            summary[dimension].setdefault(bucket, dict.fromkeys(FIELDS, 0))
+        for totals in (summary["total"], summary["series"][i.series or "Unknown"], summary["tier"][database.overall_tier(i.overall)]):
+            totals["positions"] += 1
+            totals["total_quantity"] += i.quantity
+            totals["total_stubs_invested"] += i.buy_price * i.quantity
+            totals["total_qsv"] += i.qsv * i.quantity
+            totals["total_risk"] += i.risk
+    return summary
+
+
+def test_deltas_match_full_recompute(db):
+    first = database.insert_investment(_investment("judge", 99, "Live", 1000, 2, 800))
+    database.insert_investments([
+        _investment("soto", 95, "Live", 700, 1, 600),
+        _investment("volpe", 78, "Rookie", 200, 5, 100),
+        _investment("cole", 64, None, 50, 10, 5),
+    ])
+    assert database.get_portfolio_summary() == _recompute()
+
+    database.update_investment(first.model_copy(update={"quantity": 3, "total_invested": 3000, "risk": 600}))
+    assert database.get_portfolio_summary() == _recompute()
+
+    volpe = database.get_investment_by_name("volpe")
+    database.delete_investment(volpe.id)
+    summary = database.get_portfolio_summary()
+    assert summary == _recompute()
+    # Emptied buckets drop out instead of showing zeros
+    assert "Rookie" not in summary["series"]
+
+
+def test_backfill_on_existing_database(tmp_path):
+    path = str(tmp_path / "market.db")
+    database.init_db(path, pool_size=1)
+    try:
+        database.insert_investment(_investment("judge", 99, "Live", 1000, 2, 800))
+        with database.transaction() as conn:
+            conn.execute("DELETE FROM portfolio_aggregates")
+        database.init_db(path, pool_size=1)
+        assert database.get_portfolio_summary() == _recompute()
+    finally:
+        database.close_db()
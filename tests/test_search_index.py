@@ -0,0 +1,41 @@
+from app.services.search_index import PlayerSearchIndex, search_key
+
+
+def _index():
+    return PlayerSearchIndex([
+        {"uuid": "1", "name": "J.D. Martínez", "overall": 82},
+        {"uuid": "2", "name": "Julio Rodríguez", "overall": 95},
+        {"uuid": "3", "name": "Juan Soto", "overall": 97},
+        {"uuid": "4", "name": "Jose Ramirez", "overall": 92},
+        {"uuid": "5", "name": "Aaron Judge", "overall": 99},
+    ])
+
+
+def _uuids(results):
+    return [card["uuid"] for card in results]
+
+
+def test_search_key_is_accent_and_punctuation_insensitive():
+    assert search_key("J.D. Martínez") == "jd martinez"
+
+
+def test_full_name_prefix_ranks_before_word_prefix():
+    # 'ju' starts Julio and Juan (by overall), and only a later word of Aaron Judge
+    assert _uuids(_index().search("ju"))[:3] == ["3", "2", "5"]
+
+
+def test_word_prefix_and_accents():
+    index = _index()
+    assert _uuids(index.search("rodriguez")) == ["2"]
+    assert _uuids(index.search("martinez")) == ["1"]
+
+
+def test_fuzzy_fallback_finds_typos():
+    assert _uuids(_index().search("jaun soto"))[0] == "3"
+
+
+def test_limit_and_empty_query():
+    index = _index()
+    assert len(index.search("j", limit=2)) == 2
+    assert index.search("") == []
+    assert index.search("zzzz") == []